@@ -1,8 +1,16 @@
 """Python iterables in a functional-programming style."""
 from chained_iterable.chained_iterable import ChainedIterable
 from chained_iterable.errors import EmptyIterableError
+from chained_iterable.errors import MemoryBudgetExceededError
 from chained_iterable.errors import MultipleElementsError
+from chained_iterable.pipeline import pure
 
 
 __version__ = "0.4.6"
-_ = {EmptyIterableError, MultipleElementsError, ChainedIterable}
+_ = {
+    EmptyIterableError,
+    MemoryBudgetExceededError,
+    MultipleElementsError,
+    ChainedIterable,
+    pure,
+}
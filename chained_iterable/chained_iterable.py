@@ -1,8 +1,6 @@
 from functools import reduce
 from itertools import accumulate
 from itertools import chain
-from itertools import combinations
-from itertools import combinations_with_replacement
 from itertools import compress
 from itertools import count
 from itertools import cycle
@@ -10,29 +8,34 @@ from itertools import dropwhile
 from itertools import filterfalse
 from itertools import groupby
 from itertools import islice
-from itertools import permutations
-from itertools import product
 from itertools import repeat
 from itertools import starmap
 from itertools import tee
 from itertools import zip_longest
 from operator import add
+from operator import getitem
 from operator import itemgetter
+from operator import length_hint
 from sys import maxsize
+from time import monotonic
 from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import FrozenSet
+from typing import Hashable
 from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Set
+from typing import Sized
 from typing import Tuple
 from typing import Type
 from typing import TypeVar
 from typing import Union
 
+from more_itertools import divide
 from more_itertools.recipes import all_equal
 from more_itertools.recipes import consume
 from more_itertools.recipes import dotproduct
@@ -46,7 +49,6 @@ from more_itertools.recipes import nth_combination
 from more_itertools.recipes import padnone
 from more_itertools.recipes import pairwise
 from more_itertools.recipes import partition
-from more_itertools.recipes import powerset
 from more_itertools.recipes import prepend
 from more_itertools.recipes import quantify
 from more_itertools.recipes import random_combination
@@ -61,10 +63,48 @@ from more_itertools.recipes import take
 from more_itertools.recipes import unique_everseen
 from more_itertools.recipes import unique_justseen
 
+from chained_iterable.combinatorics import Combinations
+from chained_iterable.combinatorics import CombinationsWithReplacement
+from chained_iterable.combinatorics import CombinatorialView
+from chained_iterable.combinatorics import Permutations
+from chained_iterable.combinatorics import Powerset
+from chained_iterable.combinatorics import Product
+from chained_iterable.combinatorics import size_of
 from chained_iterable.errors import EmptyIterableError
+from chained_iterable.errors import MemoryBudgetExceededError
 from chained_iterable.errors import MultipleElementsError
 from chained_iterable.errors import UnsupportVersionError
+from chained_iterable.live import LiveView
+from chained_iterable.memory import MemoryBudget
+from chained_iterable.memory import spill
+from chained_iterable.persist import persist
+from chained_iterable.persist import pipeline_key
+from chained_iterable.persist import PathLikeStr
+from chained_iterable.pipeline import is_rewritable
+from chained_iterable.pipeline import Replay
+from chained_iterable.pipeline import rewrite
+from chained_iterable.pipeline import Stage
+from chained_iterable.process import decode_line
+from chained_iterable.process import encode_line
+from chained_iterable.process import through_process
+from chained_iterable.records import getter
+from chained_iterable.records import Op
+from chained_iterable.records import unzip
+from chained_iterable.records import where
+from chained_iterable.records import with_column
+from chained_iterable.safe import DeadLetter
+from chained_iterable.safe import map_safe
+from chained_iterable.shared import SharedIterator
+from chained_iterable.shaping import debounce
+from chained_iterable.shaping import sample_every
+from chained_iterable.shaping import throttle
+from chained_iterable.shaping import TokenBucket
+from chained_iterable.sketches import HyperLogLog
+from chained_iterable.sketches import QuantileSketch
+from chained_iterable.sketches import Reservoir
+from chained_iterable.sketches import SpaceSaving
 from chained_iterable.utilities import drop_sentinel
+from chained_iterable.utilities import is_islice_compatible
 from chained_iterable.utilities import second
 from chained_iterable.utilities import Sentinel
 from chained_iterable.utilities import sentinel
@@ -106,11 +146,13 @@ else:
 
 
 class ChainedIterable(Iterable[_T]):
-    __slots__ = ("_iterable",)
+    __slots__ = ("_iterable", "_source", "_stages", "_parent", "_budget")
 
     def __init__(self, iterable: Iterable[_T]) -> None:
         try:
-            iter(iterable)
+            # a Replay would run its whole factory just to be checked
+            if not isinstance(iterable, Replay):
+                iter(iterable)
         except TypeError as error:
             (msg,) = error.args
             raise TypeError(
@@ -118,19 +160,39 @@ class ChainedIterable(Iterable[_T]):
             )
         else:
             self._iterable = iterable
+            # the lineage is the root source and every stage piped onto it;
+            # only the parents of rewritable stages are kept alive
+            self._source: Iterable = iterable
+            self._stages: Tuple[Stage, ...] = ()
+            self._parent: Optional[ChainedIterable] = None
+            self._budget: Optional[MemoryBudget] = None
 
     def __eq__(self, other: Any) -> bool:
         try:
             iter(other)
         except TypeError:
             return False
-        else:
-            return self.list() == list(other)
+        if isinstance(self._iterable, Sized) and isinstance(other, Sized):
+            if size_of(self._iterable) != size_of(other):
+                return False
+        for x, y in zip_longest(self._iterable, other, fillvalue=sentinel):
+            if (x is sentinel) or (y is sentinel):
+                return False
+            elif not ((x is y) or (x == y)):
+                return False
+        return True
 
     def __getitem__(self, item: Union[int, slice]) -> _T:
         if isinstance(item, int):
             if item < 0:
                 raise IndexError(f"Expected a non-negative index; got {item}")
+            elif isinstance(self._iterable, Sequence):
+                try:
+                    return self._iterable[item]
+                except IndexError:
+                    raise IndexError(
+                        f"{type(self).__name__} index out of range",
+                    ) from None
             elif item > maxsize:
                 raise IndexError(
                     f"Expected an index at most {maxsize}; got {item}",
@@ -168,7 +230,7 @@ class ChainedIterable(Iterable[_T]):
         return any(self._iterable)
 
     def dict(self: "ChainedIterable[Tuple[_T,_U]]") -> Dict[_T, _U]:
-        return dict(self._iterable)
+        return dict(self._tracked("dict")._iterable)
 
     def enumerate(self, start: int = 0) -> "ChainedIterable[Tuple[int, _T]]":
         return self.pipe(enumerate, start=start, index=0)
@@ -179,10 +241,10 @@ class ChainedIterable(Iterable[_T]):
         return self.pipe(filter, func, index=1)
 
     def frozenset(self) -> FrozenSet[_T]:
-        return frozenset(self._iterable)
+        return frozenset(self._tracked("frozenset")._iterable)
 
     def list(self) -> List[_T]:
-        return list(self._iterable)
+        return list(self._tracked("list")._iterable)
 
     def map(
         self, func: Callable[..., _U], *iterables: Iterable,
@@ -221,7 +283,7 @@ class ChainedIterable(Iterable[_T]):
         return self.pipe(reversed, index=0)
 
     def set(self) -> Set[_T]:
-        return set(self._iterable)
+        return set(self._tracked("set")._iterable)
 
     def sorted(
         self,
@@ -229,14 +291,16 @@ class ChainedIterable(Iterable[_T]):
         key: Optional[Callable[[_T], Any]] = None,
         reverse: bool = False,
     ) -> List[_T]:
-        return sorted(self._iterable, key=key, reverse=reverse)
+        return sorted(
+            self._tracked("sorted")._iterable, key=key, reverse=reverse,
+        )
 
     def sum(self, start: Union[_T, Sentinel] = sentinel) -> _T:
         args, _ = drop_sentinel(start)
         return sum(self._iterable, *args)
 
     def tuple(self) -> Tuple[_T, ...]:
-        return tuple(self._iterable)
+        return tuple(self._tracked("tuple")._iterable)
 
     def zip(self, *iterables: Iterable) -> "ChainedIterable[Tuple]":
         return self.pipe(zip, *iterables, index=0)
@@ -244,7 +308,32 @@ class ChainedIterable(Iterable[_T]):
     # extra public methods
 
     def cache(self) -> "ChainedIterable[_T]":
-        return self.pipe(list, index=0)
+        # the lineage is kept, so that live() and persist() still see the
+        # source and stages behind the cached elements
+        if self._budget is None:
+            return self._with_lineage(type(self)(self.list()))
+        buffer: List[_T] = []
+        iterator = iter(self._iterable)
+        try:
+            buffer.extend(self._budget.track("cache", iterator))
+        except MemoryBudgetExceededError:
+            if not self._budget.spill:
+                raise
+            iterable = type(self).from_factory(spill(buffer, iterator))
+        else:
+            iterable = type(self)(buffer)
+        iterable._budget = self._budget
+        return self._with_lineage(iterable)
+
+    def count_until(self, limit: int) -> int:
+        return self.islice(limit).len()
+
+    def divide(self, n: int) -> Tuple["ChainedIterable[_T]", ...]:
+        if isinstance(self._iterable, CombinatorialView):
+            iterable = self.pipe(CombinatorialView.split, n, index=0)
+        else:
+            iterable = self.pipe(divide, n, index=1)
+        return iterable.map(type(self)).tuple()
 
     def first(self) -> _T:
         try:
@@ -252,16 +341,63 @@ class ChainedIterable(Iterable[_T]):
         except StopIteration:
             raise EmptyIterableError from None
 
+    @classmethod
+    def from_factory(
+        cls, factory: Callable[[], Iterable[_T]],
+    ) -> "ChainedIterable[_T]":
+        return cls(Replay(factory))
+
     def last(self) -> _T:
         return self.reduce(second)
 
     def len(self) -> int:
+        if isinstance(self._iterable, Sized):
+            return size_of(self._iterable)
         iterable = self.enumerate(start=1).map(itemgetter(0))
         try:
             return iterable.last()
         except EmptyIterableError:
             return 0
 
+    def len_at_least(self, n: int) -> bool:
+        return self.count_until(n) == n
+
+    def len_at_most(self, n: int) -> bool:
+        return self.count_until(n + 1) <= n
+
+    def live(
+        self,
+        func: Callable[[_U, _T], _U],
+        initial: Union[_U, Sentinel] = sentinel,
+    ) -> LiveView[_T, _U]:
+        source, stages = self._lineage()
+        return LiveView(source, stages, func, initial=initial).refresh()
+
+    def map_safe(
+        self,
+        func: Callable[[_T], _U],
+        *,
+        on_error: str = "raise",
+        retries: int = 0,
+        backoff: float = 0.0,
+        timeout: Optional[float] = None,
+    ) -> Tuple["ChainedIterable[_U]", "ChainedIterable[DeadLetter]"]:
+        dead_letters: List[DeadLetter] = []
+        results = self.pipe(
+            map_safe,
+            func,
+            dead_letters,
+            on_error=on_error,
+            retries=retries,
+            backoff=backoff,
+            timeout=timeout,
+            index=1,
+        )
+        return results, type(self)(dead_letters)
+
+    def memory_peaks(self) -> Dict[str, int]:
+        return {} if self._budget is None else self._budget.peaks
+
     def one(self) -> _T:
         head: List[_T] = self.islice(2).list()
         if head:
@@ -275,6 +411,26 @@ class ChainedIterable(Iterable[_T]):
         else:
             raise EmptyIterableError
 
+    def persist(
+        self,
+        cache_dir: PathLikeStr,
+        *,
+        source_fingerprint: Optional[str] = None,
+        version: Optional[str] = None,
+        chunk_size: int = 1024,
+        max_bytes: Optional[int] = None,
+    ) -> "ChainedIterable[_T]":
+        source, stages = self._lineage()
+        key = pipeline_key(source, stages, source_fingerprint, version=version)
+        return self.pipe(
+            persist,
+            cache_dir,
+            key,
+            chunk_size=chunk_size,
+            max_bytes=max_bytes,
+            index=0,
+        )
+
     def pipe(
         self,
         func: Callable[..., Iterable[_U]],
@@ -282,13 +438,44 @@ class ChainedIterable(Iterable[_T]):
         index: int = 0,
         **kwargs: Any,
     ) -> "ChainedIterable[_U]":
-        new_args = chain(
-            islice(args, index), [self._iterable], islice(args, index, None),
+        return self._pipe_stage(Stage(func, args, index, kwargs))
+
+    def shared(self, batch: int = 64) -> SharedIterator[_T]:
+        return SharedIterator(self._iterable, batch=batch)
+
+    def through_process(
+        self,
+        argv: Sequence[str],
+        *,
+        encode: Callable[[_T], bytes] = encode_line,
+        decode: Callable[[bytes], _U] = decode_line,
+        buffer_size: int = 1 << 16,
+        check: bool = True,
+    ) -> "ChainedIterable[_U]":
+        return self.pipe(
+            through_process,
+            argv,
+            encode=encode,
+            decode=decode,
+            buffer_size=buffer_size,
+            check=check,
+            index=0,
         )
-        return type(self)(func(*new_args, **kwargs))
 
-    def unzip(self: "ChainedIterable[Tuple]") -> "ChainedIterable":
-        return type(self)(zip(*self._iterable))
+    def unzip(
+        self: "ChainedIterable[Tuple]", lazy: bool = False,
+    ) -> "ChainedIterable":
+        if lazy:
+            return type(self)(unzip(self._iterable)).map(type(self))
+        else:
+            return type(self)(zip(*self._tracked("unzip")._iterable))
+
+    def with_memory_limit(
+        self, limit: int, *, spill: bool = False,
+    ) -> "ChainedIterable[_T]":
+        iterable = self._copy()
+        iterable._budget = MemoryBudget(limit, spill=spill)
+        return iterable
 
     # functools
 
@@ -354,6 +541,10 @@ class ChainedIterable(Iterable[_T]):
         step: Union[int, Sentinel] = sentinel,
     ) -> "ChainedIterable[_T]":
         args, _ = drop_sentinel(stop, step)
+        if isinstance(self._iterable, (range, CombinatorialView)):
+            item = slice(start, *args)
+            if is_islice_compatible(item):
+                return self.pipe(getitem, item, index=0)
         return self.pipe(islice, start, *args, index=0)
 
     def starmap(self, func: Callable[[Tuple], _U]) -> "ChainedIterable[_U]":
@@ -370,20 +561,20 @@ class ChainedIterable(Iterable[_T]):
     def product(
         self, *iterables: Iterable, repeat: int = 1,
     ) -> "ChainedIterable[_T]":
-        return self.pipe(product, *iterables, repeat=repeat, index=0)
+        return self.pipe(Product, *iterables, repeat=repeat, index=0)
 
     def permutations(
         self, r: Optional[int] = None,
     ) -> "ChainedIterable[Tuple[_T]]":
-        return self.pipe(permutations, r=r, index=0)
+        return self.pipe(Permutations, r=r, index=0)
 
     def combinations(self, r: int) -> "ChainedIterable[Tuple[_T]]":
-        return self.pipe(combinations, r, index=0)
+        return self.pipe(Combinations, r, index=0)
 
     def combinations_with_replacement(
         self, r: int,
     ) -> "ChainedIterable[Tuple[_T]]":
-        return self.pipe(combinations_with_replacement, r, index=0)
+        return self.pipe(CombinationsWithReplacement, r, index=0)
 
     # itertools-recipes
 
@@ -400,7 +591,7 @@ class ChainedIterable(Iterable[_T]):
         return cls(tabulate(func, start=start))
 
     def tail(self, n: int) -> "ChainedIterable[_T]":
-        return self.pipe(tail, n, index=1)
+        return self._tracked("tail", retained=n).pipe(tail, n, index=1)
 
     def consume(self, n: Optional[int] = None) -> "ChainedIterable[_T]":
         return self.pipe(consume, n=n, index=1)
@@ -446,7 +637,7 @@ class ChainedIterable(Iterable[_T]):
         return self.pipe(partition, func, index=1).map(type(self)).tuple()
 
     def powerset(self) -> "ChainedIterable[Tuple[_T,...]]":
-        return self.pipe(powerset, index=0)
+        return self.pipe(Powerset, index=0)
 
     def roundrobin(self, *iterables: Iterable[_T]) -> "ChainedIterable[_T]":
         return self.pipe(roundrobin, *iterables, index=0)
@@ -454,7 +645,8 @@ class ChainedIterable(Iterable[_T]):
     def unique_everseen(
         self, key: Optional[Callable[[_T], Any]] = None,
     ) -> "ChainedIterable[_T]":
-        return self.pipe(unique_everseen, key=key, index=0)
+        iterable = self.pipe(unique_everseen, key=key, index=0)
+        return iterable._tracked("unique_everseen")
 
     def unique_justseen(
         self, key: Optional[Callable[[_T], Any]] = None,
@@ -480,16 +672,152 @@ class ChainedIterable(Iterable[_T]):
     def random_product(
         self, *iterables: Iterable, repeat: int = 1,
     ) -> Tuple[_T, ...]:
-        return random_product(self._iterable, *iterables, repeat=repeat)
+        iterable = self._tracked("random_product")._iterable
+        return random_product(iterable, *iterables, repeat=repeat)
 
     def random_permutation(self, r: Optional[int] = None) -> Tuple[_T, ...]:
-        return random_permutation(self._iterable, r=r)
+        return random_permutation(
+            self._tracked("random_permutation")._iterable, r=r,
+        )
 
     def random_combination(self, r: int) -> Tuple[_T, ...]:
-        return random_combination(self._iterable, r)
+        return random_combination(
+            self._tracked("random_combination")._iterable, r,
+        )
 
     def random_combination_with_replacement(self, r: int) -> Tuple[_T, ...]:
-        return random_combination_with_replacement(self._iterable, r)
+        iterable = self._tracked(
+            "random_combination_with_replacement",
+        )._iterable
+        return random_combination_with_replacement(iterable, r)
 
     def nth_combination(self, r: int, index: int) -> Tuple[_T, ...]:
         return nth_combination(self._iterable, r, index)
+
+    # sketches
+
+    def approx_distinct(self, precision: int = 14) -> HyperLogLog:
+        return HyperLogLog(precision).update(self._iterable)
+
+    def approx_quantiles(
+        self, k: int = 200, seed: Optional[int] = None,
+    ) -> QuantileSketch:
+        return QuantileSketch(k, seed=seed).update(self._iterable)
+
+    def heavy_hitters(self, k: int) -> SpaceSaving[_T]:
+        return SpaceSaving(k).update(self._iterable)
+
+    def sample(
+        self,
+        k: int,
+        weight: Optional[Callable[[_T], float]] = None,
+        seed: Optional[int] = None,
+    ) -> Reservoir[_T]:
+        reservoir: Reservoir[_T] = Reservoir(k, seed=seed)
+        if weight is None:
+            return reservoir.update(self._iterable)
+        for x in self._iterable:
+            reservoir.add(x, weight(x))
+        return reservoir
+
+    # records
+
+    def select(
+        self, *fields: Hashable, attr: bool = False,
+    ) -> "ChainedIterable":
+        return self.map(getter(fields, attr=attr))
+
+    def where(
+        self, field: Hashable, op: Op, value: Any, *, attr: bool = False,
+    ) -> "ChainedIterable[_T]":
+        return self.filter(where(field, op, value, attr=attr))
+
+    def with_column(
+        self, name: Hashable, func: Callable[[_T], Any],
+    ) -> "ChainedIterable":
+        return self.map(with_column(name, func))
+
+    # shaping
+
+    def throttle(
+        self,
+        rate: Optional[float] = None,
+        burst: float = 1.0,
+        *,
+        bucket: Optional[TokenBucket] = None,
+    ) -> "ChainedIterable[_T]":
+        if bucket is None:
+            if rate is None:
+                raise ValueError("Expected a rate or a bucket")
+            bucket = TokenBucket(rate, burst)
+        return self.pipe(throttle, bucket, index=0)
+
+    def debounce(
+        self, interval: float, *, clock: Callable[[], float] = monotonic,
+    ) -> "ChainedIterable[_T]":
+        return self.pipe(debounce, interval, clock=clock, index=0)
+
+    def sample_every(
+        self, interval: float, *, clock: Callable[[], float] = monotonic,
+    ) -> "ChainedIterable[_T]":
+        return self.pipe(sample_every, interval, clock=clock, index=0)
+
+    # private
+
+    def _lineage(self) -> Tuple[Iterable, Tuple[Stage, ...]]:
+        return self._source, self._stages
+
+    def _copy(self) -> "ChainedIterable[_T]":
+        iterable = self._with_lineage(type(self)(self._iterable))
+        iterable._parent = self._parent
+        iterable._budget = self._budget
+        return iterable
+
+    def _is_pristine(self) -> bool:
+        # a rewrite re-pipes from the parent, which only gives the same
+        # results if this node has yielded nothing the parent would yield again
+        parent = self._parent._iterable
+        if isinstance(parent, Replay):
+            return True
+        elif self._stages[-1].func is reversed:
+            return isinstance(parent, Sized) and (
+                length_hint(self._iterable, -1) == len(parent)
+            )
+        else:
+            # a map over a single-use iterator shares its position, so it is
+            # equivalent however much of it has been consumed
+            return iter(parent) is parent
+
+    def _pipe_stage(self, stage: Stage) -> "ChainedIterable":
+        if (self._parent is not None) and self._is_pristine():
+            rewritten = rewrite(self._stages[-1], stage)
+            if rewritten is not None:
+                iterable = self._parent._copy()
+                iterable._budget = self._budget
+                for new_stage in rewritten:
+                    iterable = iterable._pipe_stage(new_stage)
+                return iterable
+        if isinstance(self._iterable, Replay):
+            iterable = type(self)(self._iterable.extend(stage))
+        else:
+            iterable = type(self)(stage.apply(self._iterable))
+        iterable._source = self._source
+        iterable._stages = (*self._stages, stage)
+        if is_rewritable(stage):
+            iterable._parent = self
+        iterable._budget = self._budget
+        return iterable
+
+    def _with_lineage(self, iterable: "ChainedIterable") -> "ChainedIterable":
+        iterable._source, iterable._stages = self._source, self._stages
+        return iterable
+
+    def _tracked(
+        self, name: str, retained: Optional[int] = None,
+    ) -> "ChainedIterable[_T]":
+        if self._budget is None:
+            return self
+        else:
+            return self.pipe(
+                self._budget.track, name, retained=retained, index=1,
+            )
@@ -0,0 +1,255 @@
+from abc import abstractmethod
+from copy import copy
+from functools import reduce
+from itertools import combinations
+from itertools import combinations_with_replacement
+from itertools import permutations
+from itertools import product
+from math import factorial
+from operator import mul
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Sized
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from more_itertools.recipes import powerset
+
+
+_T = TypeVar("_T")
+_V = TypeVar("_V", bound="CombinatorialView")
+
+
+def _comb(n: int, k: int) -> int:
+    if not 0 <= k <= n:
+        return 0
+    return factorial(n) // (factorial(k) * factorial(n - k))
+
+
+def _perm(n: int, k: int) -> int:
+    if not 0 <= k <= n:
+        return 0
+    return factorial(n) // factorial(n - k)
+
+
+def range_size(r: range) -> int:
+    # len() of a range is capped at sys.maxsize, but its bounds are not
+    return max(0, -((r.start - r.stop) // r.step))
+
+
+def size_of(x: Sized) -> int:
+    if isinstance(x, CombinatorialView):
+        return x.size
+    elif isinstance(x, range):
+        return range_size(x)
+    else:
+        return len(x)
+
+
+def _check_r(r: int) -> None:
+    if r < 0:
+        raise ValueError("r must be non-negative")
+
+
+def _unrank_combination(
+    pool: Tuple[_T, ...], r: int, index: int,
+) -> Tuple[_T, ...]:
+    n = len(pool)
+    out: List[_T] = []
+    start = 0
+    for j in range(r):
+        for e in range(start, n):
+            size = _comb(n - e - 1, r - j - 1)
+            if index < size:
+                out.append(pool[e])
+                start = e + 1
+                break
+            index -= size
+    return tuple(out)
+
+
+class CombinatorialView(Sequence[Tuple[_T, ...]]):
+    """A lazy, indexable view over a contiguous range of a search space."""
+
+    __slots__ = ("_pool", "_range")
+
+    def __init__(self, iterable: Iterable[_T]) -> None:
+        self._pool: Tuple[_T, ...] = tuple(iterable)
+        self._range = range(0)
+
+    def __getitem__(self, item: Union[int, slice]) -> Any:
+        if isinstance(item, slice):
+            view = copy(self)
+            view._range = self._range[item]
+            return view
+        else:
+            return self._unrank(self._range[item])
+
+    def __iter__(self) -> Iterator[Tuple[_T, ...]]:
+        if self._range == range(self._size()):
+            yield from self._iterate()
+        else:
+            for index in self._range:
+                yield self._unrank(index)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of length {self.size}>"
+
+    @property
+    def size(self) -> int:
+        """The length, even past sys.maxsize where len() overflows."""
+        return range_size(self._range)
+
+    def split(self: _V, k: int) -> List[_V]:
+        if k < 1:
+            raise ValueError(f"Expected k at least 1; got {k}")
+        q, r = divmod(self.size, k)
+        bounds = [i * q + min(i, r) for i in range(k + 1)]
+        return [self[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+    def _init_range(self) -> None:
+        self._range = range(self._size())
+
+    @abstractmethod
+    def _iterate(self) -> Iterator[Tuple[_T, ...]]:
+        ...
+
+    @abstractmethod
+    def _size(self) -> int:
+        ...
+
+    @abstractmethod
+    def _unrank(self, index: int) -> Tuple[_T, ...]:
+        ...
+
+
+class Product(CombinatorialView[_T]):
+    __slots__ = ("_pools",)
+
+    def __init__(
+        self, iterable: Iterable[_T], *iterables: Iterable[_T], repeat: int = 1,
+    ) -> None:
+        if repeat < 0:
+            raise ValueError("repeat argument cannot be negative")
+        super().__init__(iterable)
+        self._pools = (self._pool, *map(tuple, iterables)) * repeat
+        self._init_range()
+
+    def _iterate(self) -> Iterator[Tuple[_T, ...]]:
+        return product(*self._pools)
+
+    def _size(self) -> int:
+        return reduce(mul, map(len, self._pools), 1)
+
+    def _unrank(self, index: int) -> Tuple[_T, ...]:
+        out: List[_T] = []
+        for pool in reversed(self._pools):
+            index, i = divmod(index, len(pool))
+            out.append(pool[i])
+        return tuple(reversed(out))
+
+
+class Permutations(CombinatorialView[_T]):
+    __slots__ = ("_r",)
+
+    def __init__(self, iterable: Iterable[_T], r: Optional[int] = None) -> None:
+        super().__init__(iterable)
+        self._r = len(self._pool) if r is None else r
+        _check_r(self._r)
+        self._init_range()
+
+    def _iterate(self) -> Iterator[Tuple[_T, ...]]:
+        return permutations(self._pool, self._r)
+
+    def _size(self) -> int:
+        return _perm(len(self._pool), self._r)
+
+    def _unrank(self, index: int) -> Tuple[_T, ...]:
+        n, remaining = len(self._pool), list(self._pool)
+        out: List[_T] = []
+        for j in range(self._r):
+            i, index = divmod(index, _perm(n - j - 1, self._r - j - 1))
+            out.append(remaining.pop(i))
+        return tuple(out)
+
+
+class Combinations(CombinatorialView[_T]):
+    __slots__ = ("_r",)
+
+    def __init__(self, iterable: Iterable[_T], r: int) -> None:
+        super().__init__(iterable)
+        _check_r(r)
+        self._r = r
+        self._init_range()
+
+    def _iterate(self) -> Iterator[Tuple[_T, ...]]:
+        return combinations(self._pool, self._r)
+
+    def _size(self) -> int:
+        return _comb(len(self._pool), self._r)
+
+    def _unrank(self, index: int) -> Tuple[_T, ...]:
+        return _unrank_combination(self._pool, self._r, index)
+
+
+class CombinationsWithReplacement(CombinatorialView[_T]):
+    __slots__ = ("_r",)
+
+    def __init__(self, iterable: Iterable[_T], r: int) -> None:
+        super().__init__(iterable)
+        _check_r(r)
+        self._r = r
+        self._init_range()
+
+    def _iterate(self) -> Iterator[Tuple[_T, ...]]:
+        return combinations_with_replacement(self._pool, self._r)
+
+    def _size(self) -> int:
+        n = len(self._pool)
+        return _comb(n + self._r - 1, self._r) if n else int(self._r == 0)
+
+    def _unrank(self, index: int) -> Tuple[_T, ...]:
+        n = len(self._pool)
+        out: List[_T] = []
+        start = 0
+        for j in range(self._r):
+            rest = self._r - j - 1
+            for e in range(start, n):
+                size = _comb(n - e + rest - 1, rest)
+                if index < size:
+                    out.append(self._pool[e])
+                    start = e
+                    break
+                index -= size
+        return tuple(out)
+
+
+class Powerset(CombinatorialView[_T]):
+    __slots__ = ()
+
+    def __init__(self, iterable: Iterable[_T]) -> None:
+        super().__init__(iterable)
+        self._init_range()
+
+    def _iterate(self) -> Iterator[Tuple[_T, ...]]:
+        return powerset(self._pool)
+
+    def _size(self) -> int:
+        return 2 ** len(self._pool)
+
+    def _unrank(self, index: int) -> Tuple[_T, ...]:
+        n = len(self._pool)
+        for r in range(n + 1):
+            size = _comb(n, r)
+            if index < size:
+                return _unrank_combination(self._pool, r, index)
+            index -= size
+        raise IndexError(index)  # pragma: no cover
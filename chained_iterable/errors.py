@@ -8,3 +8,7 @@ class EmptyIterableError(ValueError):
 
 class MultipleElementsError(ValueError):
     """Raised when an Iterable unexpectedly contains more than 1 element."""
+
+
+class MemoryBudgetExceededError(MemoryError):
+    """Raised when a buffering stage exceeds its memory budget."""
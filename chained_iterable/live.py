@@ -0,0 +1,145 @@
+from itertools import accumulate
+from itertools import starmap
+from operator import add
+from typing import Any
+from typing import Callable
+from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from more_itertools.recipes import unique_everseen
+
+from chained_iterable.errors import EmptyIterableError
+from chained_iterable.pipeline import Stage
+from chained_iterable.utilities import Sentinel
+from chained_iterable.utilities import sentinel
+
+
+_T = TypeVar("_T")
+_U = TypeVar("_U")
+Step = Callable[[Iterable], Iterator]
+
+
+# steps
+
+
+def _accumulate_step(
+    func: Callable[[Any, Any], Any] = add, initial: Any = None,
+) -> Step:
+    total = sentinel if initial is None else initial
+    pending = initial is not None
+
+    def step(delta: Iterable) -> Iterator:
+        nonlocal total, pending
+        if pending:
+            pending = False
+            yield total
+        for x in delta:
+            total = x if total is sentinel else func(total, x)
+            yield total
+
+    return step
+
+
+def _enumerate_step(start: int = 0) -> Step:
+    counter = start
+
+    def step(delta: Iterable) -> Iterator:
+        nonlocal counter
+        for x in delta:
+            yield counter, x
+            counter += 1
+
+    return step
+
+
+def _unique_everseen_step(key: Optional[Callable[[Any], Any]] = None) -> Step:
+    seen: Set[Any] = set()
+
+    def step(delta: Iterable) -> Iterator:
+        for x in delta:
+            k = x if key is None else key(x)
+            if k not in seen:
+                seen.add(k)
+                yield x
+
+    return step
+
+
+_STATEFUL = {
+    accumulate: _accumulate_step,
+    enumerate: _enumerate_step,
+    unique_everseen: _unique_everseen_step,
+}
+
+
+def _to_step(stage: Stage) -> Step:
+    if (stage.func is map) and (len(stage.args) == 1):
+        return stage.apply
+    elif stage.func in {filter, starmap}:
+        return stage.apply
+    elif stage.func in _STATEFUL:
+        return _STATEFUL[stage.func](*stage.args, **stage.kwargs)
+    else:
+        name = getattr(stage.func, "__name__", repr(stage.func))
+        raise TypeError(f"{name} cannot be maintained incrementally")
+
+
+# views
+
+
+class LiveView(Generic[_T, _U]):
+    """A fold over an append-only source that only processes new elements.
+
+    Stateful stages and the fold itself keep their state between refreshes,
+    so each refresh costs time in proportion to what was appended.
+    """
+
+    __slots__ = ("_source", "_offset", "_steps", "_func", "_value")
+
+    def __init__(
+        self,
+        source: Iterable,
+        stages: Tuple[Stage, ...],
+        func: Callable[[_U, _T], _U],
+        initial: Union[_U, Sentinel] = sentinel,
+    ) -> None:
+        if not isinstance(source, Sequence) and (iter(source) is not source):
+            raise TypeError(
+                f"Expected a sequence or a resumable iterator; got a(n) "
+                f"{type(source).__name__}",
+            )
+        self._source = source
+        self._offset = 0
+        self._steps: List[Step] = [_to_step(stage) for stage in stages]
+        self._func = func
+        self._value: Union[_U, Sentinel] = initial
+
+    def refresh(self) -> "LiveView[_T, _U]":
+        if isinstance(self._source, Sequence):
+            delta: Iterable = self._source[self._offset :]
+            self._offset += len(delta)
+        else:
+            delta = self._source
+        for step in self._steps:
+            delta = step(delta)
+        for x in delta:
+            if self._value is sentinel:
+                self._value = x
+            else:
+                self._value = self._func(self._value, x)
+        return self
+
+    @property
+    def value(self) -> _U:
+        if self._value is sentinel:
+            raise EmptyIterableError
+        else:
+            return self._value
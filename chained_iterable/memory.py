@@ -0,0 +1,107 @@
+from itertools import chain
+from itertools import islice
+from pickle import dump
+from pickle import HIGHEST_PROTOCOL
+from pickle import load
+from sys import getsizeof
+from tempfile import TemporaryFile
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TypeVar
+from weakref import finalize
+
+from chained_iterable.errors import MemoryBudgetExceededError
+
+
+_T = TypeVar("_T")
+_EXACT = 64
+_SAMPLE_EVERY = 32
+_SPILL_CHUNK = 1024
+
+
+class MemoryBudget:
+    """Per-stage byte estimates for buffering stages, and a limit on each."""
+
+    __slots__ = ("limit", "spill", "_peaks")
+
+    def __init__(self, limit: int, spill: bool = False) -> None:
+        if limit < 0:
+            raise ValueError(f"Expected a non-negative limit; got {limit}")
+        self.limit = limit
+        self.spill = spill
+        self._peaks: Dict[str, int] = {}
+
+    @property
+    def peaks(self) -> Dict[str, int]:
+        return dict(self._peaks)
+
+    def track(
+        self,
+        stage: str,
+        iterable: Iterable[_T],
+        retained: Optional[int] = None,
+    ) -> Iterator[_T]:
+        # the first elements are measured exactly, then every _SAMPLE_EVERY-th
+        # one; the estimate is the sampled mean times the count so far, or
+        # times the number retained by a stage that keeps only the latest
+        sampled = sampled_bytes = estimate = 0
+        for n, x in enumerate(iterable, start=1):
+            if (n <= _EXACT) or (n % _SAMPLE_EVERY == 0):
+                sampled += 1
+                sampled_bytes += getsizeof(x)
+            held = n if retained is None else min(n, retained)
+            estimate = sampled_bytes * held // sampled
+            if estimate > self._peaks.get(stage, 0):
+                self._peaks[stage] = estimate
+            yield x
+            if estimate > self.limit:
+                raise MemoryBudgetExceededError(
+                    f"{stage} buffered about {estimate} bytes, over the "
+                    f"budget of {self.limit}",
+                )
+
+
+class _SpillFile:
+    """Owns a spill file, which is closed once nothing refers to the owner.
+
+    Running replays refer to it through their frames, so the file outlives
+    the pipeline that spilled it for as long as any replay is unfinished.
+    """
+
+    __slots__ = ("file", "__weakref__")
+
+    def __init__(self) -> None:
+        self.file = TemporaryFile()
+        finalize(self, self.file.close)
+
+
+def spill(buffer: List[_T], rest: Iterator[_T]) -> Callable[[], Iterator[_T]]:
+    owner = _SpillFile()
+    iterator = chain(buffer, rest)
+    try:
+        for chunk in iter(lambda: list(islice(iterator, _SPILL_CHUNK)), []):
+            dump(chunk, owner.file, protocol=HIGHEST_PROTOCOL)
+    except BaseException:
+        owner.file.close()
+        raise
+    buffer.clear()
+
+    def replay() -> Iterator[Any]:
+        # each replay keeps its own offset, so replays may be interleaved
+        file = owner.file
+        position = 0
+        while True:
+            file.seek(position)
+            try:
+                chunk = load(file)
+            except EOFError:
+                return
+            position = file.tell()
+            yield from chunk
+
+    return replay
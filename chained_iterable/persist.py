@@ -0,0 +1,261 @@
+from functools import partial
+from gzip import open as gzip_open
+from hashlib import blake2b
+from itertools import islice
+from os import getpid
+from os import PathLike
+from os import replace
+from os import scandir
+from os import stat
+from os import utime
+from pathlib import Path
+from pickle import dump
+from pickle import dumps
+from pickle import HIGHEST_PROTOCOL
+from pickle import load
+from types import CodeType
+from types import MethodType
+from types import ModuleType
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from chained_iterable.pipeline import Replay
+from chained_iterable.pipeline import Stage
+
+
+_T = TypeVar("_T")
+_SUFFIX = ".chunks"
+PathLikeStr = Union[str, "PathLike[str]"]
+
+
+# fingerprints
+
+
+def _names(code: CodeType) -> Set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _names(const)
+    return names
+
+
+def _globals(func: Any) -> Dict[str, Any]:
+    namespace = getattr(func, "__globals__", {})
+    return {
+        name: namespace[name]
+        for name in _names(func.__code__)
+        if name in namespace
+    }
+
+
+def _describe_cell(cell: Any, seen: FrozenSet[int]) -> Any:
+    try:
+        contents = cell.cell_contents
+    except ValueError:
+        # descriptions of values are reprs, so this cannot collide with one
+        return "<empty cell>"
+    return _describe(contents, seen=seen)
+
+
+def _describe(x: Any, seen: FrozenSet[int] = frozenset()) -> Any:
+    describe = partial(_describe, seen=seen)
+    if isinstance(x, Stage):
+        return (
+            "stage",
+            describe(x.func),
+            describe(x.args),
+            x.index,
+            describe(x.kwargs),
+        )
+    elif isinstance(x, partial):
+        return (
+            "partial",
+            describe(x.func),
+            describe(x.args),
+            describe(x.keywords),
+        )
+    elif isinstance(x, (list, tuple)):
+        return tuple(map(describe, x))
+    elif isinstance(x, dict):
+        # keys may not be comparable with each other, but their descriptions'
+        # reprs always are
+        items = ((describe(k), describe(v)) for k, v in x.items())
+        return tuple(sorted(items, key=repr))
+    elif isinstance(x, CodeType):
+        return (
+            "code",
+            blake2b(x.co_code).hexdigest(),
+            describe(x.co_consts),
+            x.co_names,
+        )
+    elif isinstance(x, MethodType):
+        return ("method", describe(x.__func__), describe(x.__self__))
+    elif hasattr(x, "__code__"):
+        if id(x) in seen:
+            # recursion, which the enclosing description already covers
+            return ("function", x.__module__, x.__qualname__)
+        seen |= {id(x)}
+        describe = partial(_describe, seen=seen)
+        cells = tuple(_describe_cell(c, seen) for c in (x.__closure__ or ()))
+        return (
+            "function",
+            x.__module__,
+            x.__qualname__,
+            describe(x.__code__),
+            describe(x.__defaults__ or ()),
+            cells,
+            describe(_globals(x)),
+        )
+    elif isinstance(x, ModuleType):
+        return ("module", x.__name__)
+    elif callable(x) and hasattr(x, "__qualname__"):
+        # builtin methods, such as [].append, are bound to an instance too
+        owner = getattr(x, "__self__", None)
+        if isinstance(owner, ModuleType):
+            owner = None
+        elif owner is not None:
+            owner = describe(owner)
+        return (
+            "callable",
+            getattr(x, "__module__", None),
+            x.__qualname__,
+            owner,
+        )
+    elif isinstance(x, (type(None), bool, int, float, complex, str, bytes)):
+        return repr(x)
+    else:
+        try:
+            return ("pickle", blake2b(dumps(x, HIGHEST_PROTOCOL)).hexdigest())
+        except Exception:
+            # e.g. locks and open files, whose state cannot be captured
+            cls = type(x)
+            return ("object", cls.__module__, cls.__qualname__)
+
+
+def file_fingerprint(path: PathLikeStr, content: bool = False) -> str:
+    path = Path(path)
+    if content:
+        digest = blake2b()
+        with open(path, "rb") as file:
+            for block in iter(partial(file.read, 1 << 20), b""):
+                digest.update(block)
+        return f"{path.resolve()}:{digest.hexdigest()}"
+    else:
+        info = stat(path)
+        return f"{path.resolve()}:{info.st_size}:{info.st_mtime_ns}"
+
+
+def source_fingerprint(source: Iterable) -> str:
+    if isinstance(source, range):
+        return repr(source)
+    elif isinstance(source, (list, tuple, str, bytes, frozenset)):
+        return blake2b(dumps(source, protocol=HIGHEST_PROTOCOL)).hexdigest()
+    else:
+        raise TypeError(
+            f"Unable to fingerprint a(n) {type(source).__name__} source; "
+            "pass a source_fingerprint",
+        )
+
+
+def pipeline_key(
+    source: Iterable,
+    stages: Tuple[Stage, ...],
+    fingerprint: Optional[str],
+    version: Optional[str] = None,
+) -> str:
+    """Key a pipeline by its source and the stages applied to it.
+
+    A function is described by its code, defaults and closure values, and by
+    the globals its code names, functions among them recursively. Modules
+    and classes are described by name alone, and objects that cannot be
+    pickled by their type alone, so changes reached only through them go
+    unnoticed; bump the version to invalidate such entries.
+    """
+    if fingerprint is None:
+        fingerprint = source_fingerprint(source)
+    if isinstance(source, Replay):
+        stages = (*source.stages, *stages)
+    description = repr((fingerprint, version, _describe(stages))).encode()
+    return blake2b(description, digest_size=20).hexdigest()
+
+
+# storage
+
+
+def _read(path: Path) -> Iterator[Any]:
+    with gzip_open(path, "rb") as file:
+        while True:
+            try:
+                chunk = load(file)
+            except EOFError:
+                return
+            yield from chunk
+
+
+def _write(
+    iterable: Iterable[_T],
+    path: Path,
+    chunk_size: int,
+    max_bytes: Optional[int],
+) -> Iterator[_T]:
+    temp = path.with_name(f"{path.name}.{getpid()}.tmp")
+    iterator = iter(iterable)
+    complete = False
+    try:
+        with gzip_open(temp, "wb") as file:
+            for chunk in iter(lambda: list(islice(iterator, chunk_size)), []):
+                dump(chunk, file, protocol=HIGHEST_PROTOCOL)
+                yield from chunk
+        replace(temp, path)
+        complete = True
+    finally:
+        if not complete:
+            temp.unlink()
+    if max_bytes is not None:
+        evict(path.parent, max_bytes, keep=path)
+
+
+def evict(
+    cache_dir: PathLikeStr, max_bytes: int, keep: Optional[Path] = None,
+) -> None:
+    entries = sorted(
+        (
+            entry
+            for entry in scandir(cache_dir)
+            if entry.is_file() and entry.name.endswith(_SUFFIX)
+        ),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    total = sum(entry.stat().st_size for entry in entries)
+    for entry in entries:
+        if total <= max_bytes:
+            return
+        if (keep is None) or (Path(entry.path) != keep):
+            total -= entry.stat().st_size
+            Path(entry.path).unlink()
+
+
+def persist(
+    iterable: Iterable[_T],
+    cache_dir: PathLikeStr,
+    key: str,
+    *,
+    chunk_size: int = 1024,
+    max_bytes: Optional[int] = None,
+) -> Iterator[_T]:
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir.joinpath(key + _SUFFIX)
+    if path.exists():
+        utime(path)
+        return _read(path)
+    else:
+        return _write(iterable, path, chunk_size, max_bytes)
@@ -0,0 +1,106 @@
+from itertools import islice
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from more_itertools.recipes import take
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+_PURE = "__chained_iterable_pure__"
+
+
+class Stage(NamedTuple):
+    func: Callable[..., Iterable]
+    args: Tuple[Any, ...]
+    index: int
+    kwargs: Dict[str, Any]
+
+    def apply(self, iterable: Iterable) -> Iterable:
+        return self.func(
+            *self.args[: self.index],
+            iterable,
+            *self.args[self.index :],
+            **self.kwargs,
+        )
+
+
+class Replay(Iterable):
+    """Re-runs a source factory and its stages on every iteration."""
+
+    __slots__ = ("factory", "stages")
+
+    def __init__(
+        self, factory: Callable[[], Iterable], stages: Tuple[Stage, ...] = (),
+    ) -> None:
+        self.factory = factory
+        self.stages = stages
+
+    def __iter__(self) -> Iterator:
+        iterable = self.factory()
+        for stage in self.stages:
+            iterable = stage.apply(iterable)
+        return iter(iterable)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.factory!r}, {self.stages!r})"
+
+    def extend(self, stage: Stage) -> "Replay":
+        return type(self)(self.factory, (*self.stages, stage))
+
+
+# purity
+
+
+def _wrap(func: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapped(*args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+    return wrapped
+
+
+def pure(func: _F) -> _F:
+    """Mark a function as free of side effects, so that calls may be skipped."""
+    try:
+        setattr(func, _PURE, True)
+    except (AttributeError, TypeError):
+        return pure(_wrap(func))
+    return func
+
+
+def is_pure(func: Optional[Callable]) -> bool:
+    return (func is None) or getattr(func, _PURE, False)
+
+
+# rewriting
+
+
+def _is_pure_map(stage: Stage) -> bool:
+    return (
+        (stage.func is map)
+        and (len(stage.args) == 1)
+        and is_pure(stage.args[0])
+    )
+
+
+def is_rewritable(stage: Stage) -> bool:
+    return (stage.func is reversed) or _is_pure_map(stage)
+
+
+def rewrite(upstream: Stage, downstream: Stage) -> Optional[Tuple[Stage, ...]]:
+    if (upstream.func is reversed) and (downstream.func is reversed):
+        return ()
+    elif _is_pure_map(upstream) and (downstream.func is islice):
+        return downstream, upstream
+    elif _is_pure_map(upstream) and (downstream.func is take):
+        # take() returns a list, so the rewritten pair must still end in one
+        (n,) = downstream.args
+        return Stage(islice, (n,), 0, {}), upstream, Stage(list, (), 0, {})
+    else:
+        return None
@@ -0,0 +1,81 @@
+from subprocess import CalledProcessError
+from subprocess import PIPE
+from subprocess import Popen
+from threading import Thread
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Sequence
+from typing import TypeVar
+
+
+_T = TypeVar("_T")
+_U = TypeVar("_U")
+
+
+def encode_line(x: Any) -> bytes:
+    return f"{x}\n".encode()
+
+
+def decode_line(line: bytes) -> str:
+    return line.rstrip(b"\n").decode()
+
+
+def through_process(
+    iterable: Iterable[_T],
+    argv: Sequence[str],
+    *,
+    encode: Callable[[_T], bytes] = encode_line,
+    decode: Callable[[bytes], _U] = decode_line,
+    buffer_size: int = 1 << 16,
+    check: bool = True,
+) -> Iterator[_U]:
+    # a generator, so that nothing is spawned until the first element is pulled
+    process = Popen(
+        argv, stdin=PIPE, stdout=PIPE, stderr=PIPE, bufsize=buffer_size,
+    )
+    errors: List[BaseException] = []
+    stderr: List[bytes] = []
+
+    def write() -> None:
+        try:
+            with process.stdin:
+                for x in iterable:
+                    process.stdin.write(encode(x))
+        except BrokenPipeError:
+            pass
+        except BaseException as error:
+            errors.append(error)
+
+    # stdin and stderr get their own threads, so neither pipe can fill up
+    # while the consumer is blocked on stdout
+    writer = Thread(target=write, daemon=True)
+    reader = Thread(
+        target=lambda: stderr.append(process.stderr.read()), daemon=True,
+    )
+    threads = [writer, reader]
+    for thread in threads:
+        thread.start()
+    complete = False
+    try:
+        for line in process.stdout:
+            yield decode(line)
+        complete = True
+    finally:
+        if complete:
+            for thread in threads:
+                thread.join()
+        else:
+            # the writer may be blocked on upstream indefinitely; being a
+            # daemon, it exits on a broken pipe once upstream yields again
+            process.kill()
+            reader.join()
+        process.stdout.close()
+        process.stderr.close()
+        returncode = process.wait()
+    if errors:
+        raise errors[0]
+    elif check and returncode:
+        raise CalledProcessError(returncode, argv, stderr=b"".join(stderr))
@@ -0,0 +1,97 @@
+from itertools import tee
+from operator import attrgetter
+from operator import contains
+from operator import eq
+from operator import ge
+from operator import gt
+from operator import is_
+from operator import is_not
+from operator import itemgetter
+from operator import le
+from operator import lt
+from operator import ne
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Tuple
+from typing import Union
+
+from more_itertools.recipes import prepend
+
+
+Op = Union[str, Callable[[Any, Any], bool]]
+
+
+def _in(x: Any, y: Any) -> bool:
+    return contains(y, x)
+
+
+def _not_in(x: Any, y: Any) -> bool:
+    return not contains(y, x)
+
+
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": eq,
+    "!=": ne,
+    "<": lt,
+    "<=": le,
+    ">": gt,
+    ">=": ge,
+    "in": _in,
+    "not in": _not_in,
+    "is": is_,
+    "is not": is_not,
+}
+
+
+def getter(fields: Tuple[Hashable, ...], attr: bool = False) -> Callable:
+    if not fields:
+        raise ValueError("Expected at least 1 field")
+    return attrgetter(*fields) if attr else itemgetter(*fields)
+
+
+def where(field: Hashable, op: Op, value: Any, attr: bool = False) -> Callable:
+    if isinstance(op, str):
+        try:
+            op = _OPS[op]
+        except KeyError:
+            raise ValueError(
+                f"Expected an operator in {list(_OPS)}; got {op!r}",
+            ) from None
+    get = getter((field,), attr=attr)
+    return lambda row: op(get(row), value)
+
+
+def with_column(name: Hashable, func: Callable[[Any], Any]) -> Callable:
+    def inner(row: Any) -> Any:
+        if isinstance(row, Mapping):
+            return {**row, name: func(row)}
+        elif isinstance(row, tuple):
+            # a tuple's fields are its indices, so the name must be the index
+            # that the new column lands at
+            if name != len(row):
+                raise ValueError(
+                    f"Expected the name of a column appended to a tuple of "
+                    f"length {len(row)} to be {len(row)}; got {name!r}",
+                )
+            return (*row, func(row))
+        else:
+            raise TypeError(
+                f"Expected a mapping or tuple; got a(n) {type(row).__name__}",
+            )
+
+    return inner
+
+
+def unzip(iterable: Iterable[Tuple]) -> Tuple[Iterator, ...]:
+    iterator = iter(iterable)
+    try:
+        head = next(iterator)
+    except StopIteration:
+        return ()
+    columns = tee(prepend(head, iterator), len(head))
+    return tuple(map(itemgetter(i), column) for i, column in enumerate(columns))
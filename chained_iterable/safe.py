@@ -0,0 +1,143 @@
+from itertools import count
+from queue import Empty
+from queue import Queue
+from threading import Thread
+from time import sleep
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from chained_iterable.utilities import sentinel
+
+
+_T = TypeVar("_T")
+_U = TypeVar("_U")
+_ON_ERRORS = ("skip", "collect", "raise")
+
+
+class DeadLetter(NamedTuple):
+    index: int
+    value: Any
+    error: Exception
+
+
+def _serve(
+    func: Callable[[_T], _U],
+    inbox: "Queue[Any]",
+    outbox: "Queue[Tuple[bool, Any]]",
+) -> None:
+    while True:
+        x = inbox.get()
+        if x is sentinel:
+            return
+        try:
+            outbox.put((True, func(x)))
+        except BaseException as error:
+            outbox.put((False, error))
+
+
+class _Caller:
+    """Calls a function, on a daemon worker thread if there is a timeout.
+
+    A hung call cannot be interrupted, so on a timeout its worker is told to
+    stop once the call returns and later elements get a fresh worker. Being
+    a daemon, a worker that never returns does not hold up interpreter exit.
+    """
+
+    __slots__ = ("_func", "_timeout", "_inbox", "_outbox")
+
+    def __init__(
+        self, func: Callable[[_T], _U], timeout: Optional[float],
+    ) -> None:
+        self._func = func
+        self._timeout = timeout
+        self._inbox: "Optional[Queue[Any]]" = None
+        self._outbox: "Optional[Queue[Tuple[bool, Any]]]" = None
+
+    def __call__(self, x: _T) -> _U:
+        if self._timeout is None:
+            return self._func(x)
+        if self._inbox is None:
+            self._inbox, self._outbox = Queue(), Queue()
+            Thread(
+                target=_serve,
+                args=(self._func, self._inbox, self._outbox),
+                daemon=True,
+            ).start()
+        self._inbox.put(x)
+        try:
+            ok, result = self._outbox.get(timeout=self._timeout)
+        except Empty:
+            self.close()
+            raise TimeoutError(f"Timed out after {self._timeout}s") from None
+        if ok:
+            return result
+        else:
+            raise result
+
+    def close(self) -> None:
+        if self._inbox is not None:
+            self._inbox.put(sentinel)
+            self._inbox = self._outbox = None
+
+
+def map_safe(
+    func: Callable[[_T], _U],
+    iterable: Iterable[_T],
+    dead_letters: List[DeadLetter],
+    *,
+    on_error: str = "raise",
+    retries: int = 0,
+    backoff: float = 0.0,
+    timeout: Optional[float] = None,
+) -> Iterator[_U]:
+    if on_error not in _ON_ERRORS:
+        raise ValueError(
+            f"Expected on_error to be one of {_ON_ERRORS}; got {on_error!r}",
+        )
+    if retries < 0:
+        raise ValueError(f"Expected a non-negative retries; got {retries}")
+    return _map_safe(
+        func, iterable, dead_letters, on_error, retries, backoff, timeout,
+    )
+
+
+def _map_safe(
+    func: Callable[[_T], _U],
+    iterable: Iterable[_T],
+    dead_letters: List[DeadLetter],
+    on_error: str,
+    retries: int,
+    backoff: float,
+    timeout: Optional[float],
+) -> Iterator[_U]:
+    # a factory pipeline re-runs this stage on every iteration, so the dead
+    # letters are those of the latest run
+    dead_letters.clear()
+    call = _Caller(func, timeout)
+    try:
+        for index, x in enumerate(iterable):
+            for attempt in count():
+                try:
+                    result = call(x)
+                except Exception as error:
+                    if attempt < retries:
+                        if backoff:
+                            sleep(backoff * 2 ** attempt)
+                        continue
+                    elif on_error == "raise":
+                        raise
+                    elif on_error == "collect":
+                        dead_letters.append(DeadLetter(index, x, error))
+                    break
+                else:
+                    yield result
+                    break
+    finally:
+        call.close()
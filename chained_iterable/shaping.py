@@ -0,0 +1,119 @@
+from asyncio import sleep as async_sleep
+from threading import Lock
+from time import monotonic
+from time import sleep
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TypeVar
+
+
+_T = TypeVar("_T")
+
+
+class TokenBucket:
+    """A thread-safe token bucket; share one instance to share one rate."""
+
+    __slots__ = (
+        "rate",
+        "burst",
+        "_tokens",
+        "_updated",
+        "_lock",
+        "_clock",
+        "_sleep",
+    )
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        *,
+        clock: Callable[[], float] = monotonic,
+        sleep: Callable[[float], None] = sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Expected a positive rate; got {rate}")
+        if burst < 1:
+            raise ValueError(f"Expected a burst at least 1; got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await async_sleep(wait)
+
+    def _reserve(self, tokens: float) -> float:
+        if tokens > self.burst:
+            raise ValueError(
+                f"Expected at most {self.burst} tokens; got {tokens}",
+            )
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            # tokens may go negative: the debt is a reservation that later
+            # callers queue behind, so nobody sleeps while holding the lock
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+
+def throttle(iterable: Iterable[_T], bucket: TokenBucket) -> Iterator[_T]:
+    for x in iterable:
+        bucket.acquire()
+        yield x
+
+
+async def throttle_async(
+    iterable: AsyncIterable[_T], bucket: TokenBucket,
+) -> AsyncIterator[_T]:
+    async for x in iterable:
+        await bucket.acquire_async()
+        yield x
+
+
+def debounce(
+    iterable: Iterable[_T],
+    interval: float,
+    clock: Callable[[], float] = monotonic,
+) -> Iterator[_T]:
+    iterator = iter(iterable)
+    try:
+        last = next(iterator)
+    except StopIteration:
+        return
+    last_time = clock()
+    for x in iterator:
+        now = clock()
+        if now - last_time >= interval:
+            yield last
+        last, last_time = x, now
+    yield last
+
+
+def sample_every(
+    iterable: Iterable[_T],
+    interval: float,
+    clock: Callable[[], float] = monotonic,
+) -> Iterator[_T]:
+    next_time: Optional[float] = None
+    for x in iterable:
+        now = clock()
+        if (next_time is None) or (now >= next_time):
+            yield x
+            next_time = now + interval
@@ -0,0 +1,95 @@
+from collections import deque
+from itertools import islice
+from threading import current_thread
+from threading import local
+from threading import Lock
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TypeVar
+
+
+_T = TypeVar("_T")
+
+
+class SharedIterator(Iterator[_T]):
+    """An iterator that many threads may pull from at once.
+
+    Each thread claims ``batch`` elements at a time under the lock and then
+    serves them from its own buffer, so the lock is taken once per batch. If
+    the source raises, the elements pulled before the error are still served
+    and the error is raised by the next claim.
+    """
+
+    __slots__ = (
+        "batch",
+        "_iterator",
+        "_lock",
+        "_local",
+        "_cancelled",
+        "_exhausted",
+        "_error",
+        "_claimed",
+    )
+
+    def __init__(self, iterable: Iterable[_T], batch: int = 64) -> None:
+        if batch < 1:
+            raise ValueError(f"Expected a batch at least 1; got {batch}")
+        self.batch = batch
+        self._iterator = iter(iterable)
+        self._lock = Lock()
+        self._local = local()
+        self._cancelled = False
+        self._exhausted = False
+        self._error: Optional[BaseException] = None
+        self._claimed: Dict[str, int] = {}
+
+    def __iter__(self) -> "SharedIterator[_T]":
+        return self
+
+    def __next__(self) -> _T:
+        if self._cancelled:
+            raise StopIteration
+        buffer = getattr(self._local, "buffer", None)
+        if not buffer:
+            buffer = self._claim()
+        return buffer.popleft()
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    @property
+    def claimed(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._claimed)
+
+    def _claim(self) -> Deque[_T]:
+        with self._lock:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            elif self._exhausted or self._cancelled:
+                raise StopIteration
+            buffer: Deque[_T] = deque()
+            try:
+                for x in islice(self._iterator, self.batch):
+                    buffer.append(x)
+            except BaseException as error:
+                self._exhausted = True
+                if not buffer:
+                    raise
+                self._error = error
+            if len(buffer) < self.batch:
+                self._exhausted = True
+            if not buffer:
+                raise StopIteration
+            name = current_thread().name
+            self._claimed[name] = self._claimed.get(name, 0) + len(buffer)
+        self._local.buffer = buffer
+        return buffer
@@ -0,0 +1,324 @@
+from hashlib import blake2b
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+from heapq import heappushpop
+from heapq import heapreplace
+from heapq import nlargest
+from itertools import accumulate
+from itertools import count
+from math import log
+from math import sqrt
+from random import Random
+from typing import Any
+from typing import Dict
+from typing import Generic
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from chained_iterable.errors import EmptyIterableError
+
+
+_T = TypeVar("_T")
+_H = TypeVar("_H", bound=Hashable)
+
+
+def _encode(x: Any) -> bytes:
+    if x is None:
+        return b"n"
+    elif isinstance(x, int):
+        return b"i%d" % x
+    elif isinstance(x, float):
+        return b"i%d" % x if x.is_integer() else b"f" + repr(x).encode()
+    elif isinstance(x, str):
+        return b"s" + x.encode("utf-8", "surrogatepass")
+    elif isinstance(x, bytes):
+        return b"b" + x
+    elif isinstance(x, tuple):
+        parts = map(_encode, x)
+        return b"t" + b"".join(len(p).to_bytes(8, "big") + p for p in parts)
+    else:
+        return b"h" + hash(x).to_bytes(8, "big", signed=True)
+
+
+def _stable_hash(x: Any) -> int:
+    """Hash so that elements equal under == (as in a set) collide.
+
+    None, ints, floats, strs, bytes and tuples of them are encoded
+    canonically (1, 1.0 and True coincide), so their hashes agree across
+    processes and sketches of them can be merged anywhere. Other elements
+    fall back to hash(), which matches set semantics within one process.
+    """
+    digest = blake2b(_encode(x), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+# distinct
+
+
+class HyperLogLog:
+    __slots__ = ("precision", "_registers")
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError(
+                f"Expected a precision in [4, 18]; got {precision}",
+            )
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, x: Any) -> None:
+        hashed = _stable_hash(x)
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, iterable: Iterable[Any]) -> "HyperLogLog":
+        for x in iterable:
+            self.add(x)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if self.precision != other.precision:
+            raise ValueError(
+                f"Expected equal precisions; got {self.precision} "
+                f"and {other.precision}",
+            )
+        merged = type(self)(self.precision)
+        merged._registers = bytearray(
+            map(max, self._registers, other._registers),
+        )
+        return merged
+
+    def count(self) -> int:
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if (estimate <= 2.5 * m) and zeros:
+            estimate = m * log(m / zeros)
+        return round(estimate)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / sqrt(len(self._registers))
+
+
+# quantiles
+
+
+class QuantileSketch:
+    """A KLL sketch; compacted items of level h stand for 2 ** h inputs."""
+
+    __slots__ = ("k", "_levels", "_random")
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError(f"Expected k at least 8; got {k}")
+        self.k = k
+        self._levels: List[List[Any]] = [[]]
+        self._random = Random(seed)
+
+    def add(self, x: Any) -> None:
+        self._levels[0].append(x)
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update(self, iterable: Iterable[Any]) -> "QuantileSketch":
+        for x in iterable:
+            self.add(x)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        merged = type(self)(min(self.k, other.k))
+        merged._random.setstate(self._random.getstate())
+        num_levels = max(len(self._levels), len(other._levels))
+        merged._levels = [
+            self._level(h) + other._level(h) for h in range(num_levels)
+        ]
+        merged._compress()
+        return merged
+
+    def quantile(self, q: float) -> Any:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"Expected a quantile in [0, 1]; got {q}")
+        weighted = sorted(
+            (x, 1 << h) for h, level in enumerate(self._levels) for x in level
+        )
+        if not weighted:
+            raise EmptyIterableError
+        total = sum(w for _, w in weighted)
+        for (x, _), cum in zip(weighted, accumulate(w for _, w in weighted)):
+            if cum >= q * total:
+                return x
+        return weighted[-1][0]
+
+    def quantiles(self, qs: Iterable[float]) -> List[Any]:
+        return [self.quantile(q) for q in qs]
+
+    @property
+    def rank_error(self) -> float:
+        return 2.296 / self.k ** 0.9723
+
+    def _level(self, h: int) -> List[Any]:
+        return self._levels[h] if h < len(self._levels) else []
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - h - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def _compress(self) -> None:
+        for h in count():
+            if h >= len(self._levels):
+                return
+            level = self._levels[h]
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 == len(self._levels):
+                self._levels.append([])
+            level.sort()
+            leftover = [level.pop()] if len(level) % 2 else []
+            offset = self._random.randrange(2)
+            self._levels[h + 1].extend(level[offset::2])
+            self._levels[h] = leftover
+
+
+# heavy hitters
+
+
+class SpaceSaving(Generic[_H]):
+    """Space-Saving counters, with a min-heap of possibly lagging counts."""
+
+    __slots__ = ("k", "_counts", "_errors", "_seen", "_heap", "_tiebreak")
+
+    def __init__(self, k: int) -> None:
+        if k < 1:
+            raise ValueError(f"Expected k at least 1; got {k}")
+        self.k = k
+        self._counts: Dict[_H, int] = {}
+        self._errors: Dict[_H, int] = {}
+        self._seen = 0
+        self._heap: List[Tuple[int, int, _H]] = []
+        self._tiebreak = count()
+
+    def add(self, x: _H, weight: int = 1) -> None:
+        self._seen += weight
+        if x in self._counts:
+            self._counts[x] += weight
+        elif len(self._counts) < self.k:
+            self._counts[x] = weight
+            self._errors[x] = 0
+            heappush(self._heap, (weight, next(self._tiebreak), x))
+        else:
+            # counts only grow, so refreshing lagging entries until the top is
+            # current finds the minimum in amortised O(log k)
+            while True:
+                floor, _, evicted = self._heap[0]
+                if floor == self._counts[evicted]:
+                    break
+                heapreplace(
+                    self._heap,
+                    (self._counts[evicted], next(self._tiebreak), evicted),
+                )
+            heappop(self._heap)
+            del self._counts[evicted], self._errors[evicted]
+            self._counts[x] = floor + weight
+            self._errors[x] = floor
+            heappush(self._heap, (floor + weight, next(self._tiebreak), x))
+
+    def update(self, iterable: Iterable[_H]) -> "SpaceSaving[_H]":
+        for x in iterable:
+            self.add(x)
+        return self
+
+    def merge(self, other: "SpaceSaving[_H]") -> "SpaceSaving[_H]":
+        merged: SpaceSaving[_H] = type(self)(min(self.k, other.k))
+        self_floor, other_floor = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for x in {*self._counts, *other._counts}:
+            self_count = self._counts.get(x, self_floor)
+            other_count = other._counts.get(x, other_floor)
+            counts[x] = self_count + other_count
+            self_error = self._errors.get(x, self_floor)
+            other_error = other._errors.get(x, other_floor)
+            errors[x] = self_error + other_error
+        for x in nlargest(merged.k, counts, key=counts.__getitem__):
+            merged._counts[x] = counts[x]
+            merged._errors[x] = errors[x]
+            merged._heap.append((counts[x], next(merged._tiebreak), x))
+        heapify(merged._heap)
+        merged._seen = self._seen + other._seen
+        return merged
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[_H, int, int]]:
+        """Return (item, estimated count, maximum overestimate) triples."""
+        items = sorted(self._counts, key=self._counts.__getitem__, reverse=True)
+        return [(x, self._counts[x], self._errors[x]) for x in items[:n]]
+
+    @property
+    def error(self) -> float:
+        return self._seen / self.k
+
+    def _floor(self) -> int:
+        if len(self._counts) < self.k:
+            return 0
+        else:
+            return min(self._counts.values())
+
+
+# sampling
+
+
+class Reservoir(Generic[_T]):
+    """Weighted reservoir sampling (A-Res); unit weights sample uniformly."""
+
+    __slots__ = ("k", "_heap", "_seen", "_random", "_tiebreak")
+
+    def __init__(self, k: int, seed: Optional[int] = None) -> None:
+        if k < 0:
+            raise ValueError(f"Expected a non-negative k; got {k}")
+        self.k = k
+        self._heap: List[Tuple[float, int, _T]] = []
+        self._seen = 0
+        self._random = Random(seed)
+        self._tiebreak = count()
+
+    def add(self, x: _T, weight: float = 1.0) -> None:
+        if weight <= 0:
+            raise ValueError(f"Expected a positive weight; got {weight}")
+        self._seen += 1
+        entry = (self._random.random() ** (1 / weight), next(self._tiebreak), x)
+        if len(self._heap) < self.k:
+            heappush(self._heap, entry)
+        elif self.k:
+            heappushpop(self._heap, entry)
+
+    def update(self, iterable: Iterable[_T]) -> "Reservoir[_T]":
+        for x in iterable:
+            self.add(x)
+        return self
+
+    def merge(self, other: "Reservoir[_T]") -> "Reservoir[_T]":
+        merged: Reservoir[_T] = type(self)(min(self.k, other.k))
+        merged._random.setstate(self._random.getstate())
+        entries = (
+            (key, next(merged._tiebreak), x)
+            for key, _, x in self._heap + other._heap
+        )
+        merged._heap = sorted(nlargest(merged.k, entries))
+        merged._seen = self._seen + other._seen
+        return merged
+
+    @property
+    def items(self) -> List[_T]:
+        return [x for _, _, x in self._heap]
+
+    @property
+    def seen(self) -> int:
+        return self._seen
@@ -16,6 +16,12 @@ def second(_: Any, x: _T) -> _T:  # noqa: U101
     return x
 
 
+def is_islice_compatible(item: slice) -> bool:
+    return all((x is None) or (x >= 0) for x in (item.start, item.stop)) and (
+        (item.step is None) or (item.step > 0)
+    )
+
+
 # sentinel
 
 
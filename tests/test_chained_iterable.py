@@ -1,6 +1,8 @@
 from functools import reduce
+from itertools import chain
 from itertools import count
 from itertools import islice
+from itertools import repeat
 from operator import add
 from operator import mod
 from operator import sub
@@ -10,6 +12,7 @@ from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -106,6 +109,16 @@ def test_eq(ints: List[int], other: Union[int, List[int]]) -> None:
     )
 
 
+@given(ints=lists(integers()), other=lists(integers()))
+def test_eq_short_circuits(ints: List[int], other: List[int]) -> None:
+    assume(ints != other)
+    iterable = ChainedIterable(chain(ints, count()))
+    if len(ints) <= len(other):
+        assert iterable != chain(other, repeat(None))
+    else:
+        assert ChainedIterable(iter(other)) != iterable
+
+
 @given(ints=lists(integers()), index=integers())
 def test_get_item(ints: List[int], index: int) -> None:
     iterable = ChainedIterable(iter(ints))
@@ -289,6 +302,38 @@ def test_cache(ints: List[int]) -> None:
     iterable = ChainedIterable(iter(ints)).cache()
     assert isinstance(iterable, ChainedIterable)
     assert iterable == ints
+    cached = ChainedIterable(ints).map(abs).cache()
+    source, stages = cached._lineage()
+    assert source is ints
+    assert [stage.func for stage in stages] == [map]
+
+
+@given(ints=lists(integers()), limit=integers(0, 1000))
+def test_count_until(ints: List[int], limit: int) -> None:
+    _assert_same_type_and_equal(
+        ChainedIterable(iter(ints)).count_until(limit), min(len(ints), limit),
+    )
+
+
+@given(ints=lists(integers()), func=_int_to_int_funcs())
+def test_from_factory(ints: List[int], func: Callable[[int], int]) -> None:
+    calls: List[None] = []
+
+    def factory() -> Iterator[int]:
+        calls.append(None)
+        return iter(ints)
+
+    iterable = ChainedIterable.from_factory(factory).map(func).filter(bool)
+    assert isinstance(iterable, ChainedIterable)
+    expected = [y for y in map(func, ints) if y]
+    assert iterable.len() == len(expected)
+    assert iterable == expected
+    assert iterable.list() == expected
+    assert len(calls) == 3
+    cached = iterable.cache()
+    assert cached == expected
+    assert cached == expected
+    assert len(calls) == 4
 
 
 @given(ints=lists(integers()))
@@ -307,6 +352,18 @@ def test_len(ints: List[int]) -> None:
     _assert_same_type_and_equal(ChainedIterable(iter(ints)).len(), len(ints))
 
 
+@given(ints=lists(integers()), n=integers(0, 1000))
+def test_len_at_least_and_len_at_most(ints: List[int], n: int) -> None:
+    iterable = ChainedIterable(chain(ints, count()))
+    assert iterable.len_at_least(n)
+    _assert_same_type_and_equal(
+        ChainedIterable(iter(ints)).len_at_least(n), len(ints) >= n,
+    )
+    _assert_same_type_and_equal(
+        ChainedIterable(iter(ints)).len_at_most(n), len(ints) <= n,
+    )
+
+
 @given(ints=lists(integers()))
 def test_one(ints: List[int]) -> None:
     iterable = ChainedIterable(iter(ints))
@@ -335,6 +392,22 @@ def test_unzip(iterables: List[List[int]]) -> None:
     assert iterable == zip(*iterables)
 
 
+@given(
+    data=data(), num_rows=integers(0, 10), width=integers(1, 5),
+)
+def test_unzip_lazy(data: Any, num_rows: int, width: int) -> None:
+    rows = data.draw(
+        lists(
+            tuples(*[integers()] * width), min_size=num_rows, max_size=num_rows,
+        ),
+    )
+    iterable = ChainedIterable(iter(rows)).unzip(lazy=True)
+    assert isinstance(iterable, ChainedIterable)
+    columns = iterable.list()
+    assert all(isinstance(column, ChainedIterable) for column in columns)
+    assert [column.tuple() for column in columns] == list(zip(*rows))
+
+
 # functools
 
 
@@ -0,0 +1,144 @@
+from itertools import combinations
+from itertools import combinations_with_replacement
+from itertools import permutations
+from itertools import product
+from typing import Any
+from typing import Callable
+from typing import List
+
+from hypothesis import given
+from hypothesis.strategies import data
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from more_itertools.recipes import powerset
+from pytest import mark
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable.combinatorics import Combinations
+from chained_iterable.combinatorics import CombinationsWithReplacement
+from chained_iterable.combinatorics import CombinatorialView
+from chained_iterable.combinatorics import Permutations
+from chained_iterable.combinatorics import Powerset
+from chained_iterable.combinatorics import Product
+
+
+_small_lists = lists(integers(), max_size=5)
+
+
+def _assert_view_equal(view: CombinatorialView, expected: List[Any]) -> None:
+    assert len(view) == len(expected)
+    assert list(view) == expected
+    assert [view[i] for i in range(len(view))] == expected
+    assert [view[i] for i in range(-len(view), 0)] == expected
+
+
+@given(ints=_small_lists, others=lists(_small_lists, max_size=2), data=data())
+def test_product(ints: List[int], others: List[List[int]], data: Any) -> None:
+    repeat = data.draw(integers(0, 2))
+    _assert_view_equal(
+        Product(ints, *others, repeat=repeat),
+        list(product(ints, *others, repeat=repeat)),
+    )
+
+
+@given(ints=_small_lists, r=integers(0, 6))
+@mark.parametrize(
+    "cls, func",
+    [
+        (Permutations, permutations),
+        (Combinations, combinations),
+        (CombinationsWithReplacement, combinations_with_replacement),
+    ],
+)
+def test_r_views(
+    cls: Callable[..., CombinatorialView],
+    func: Callable[..., Any],
+    ints: List[int],
+    r: int,
+) -> None:
+    _assert_view_equal(cls(ints, r), list(func(ints, r)))
+
+
+@given(ints=_small_lists)
+def test_permutations_default_r(ints: List[int]) -> None:
+    _assert_view_equal(Permutations(ints), list(permutations(ints)))
+
+
+@given(ints=_small_lists)
+def test_powerset(ints: List[int]) -> None:
+    _assert_view_equal(Powerset(ints), list(powerset(ints)))
+
+
+@given(ints=_small_lists, data=data())
+def test_slicing(ints: List[int], data: Any) -> None:
+    view = Powerset(ints)
+    expected = list(powerset(ints))
+    start, stop = data.draw(integers(-40, 40)), data.draw(integers(-40, 40))
+    step = data.draw(integers(1, 3) | integers(-3, -1))
+    sliced = view[start:stop:step]
+    assert isinstance(sliced, Powerset)
+    _assert_view_equal(sliced, expected[start:stop:step])
+
+
+@given(ints=_small_lists, k=integers(1, 10))
+def test_split(ints: List[int], k: int) -> None:
+    view = Combinations(ints, 2)
+    parts = view.split(k)
+    assert len(parts) == k
+    assert [x for part in parts for x in part] == list(view)
+    assert max(map(len, parts)) - min(map(len, parts)) <= 1
+
+
+def test_errors() -> None:
+    with raises(ValueError, match="r must be non-negative"):
+        Combinations([1], -1)
+    with raises(ValueError, match="Expected k at least 1; got 0"):
+        Product([1]).split(0)
+    with raises(ValueError, match="repeat argument cannot be negative"):
+        ChainedIterable([1, 2]).product(repeat=-1)
+
+    class Incomplete(CombinatorialView[int]):
+        def _size(self) -> int:
+            return 0
+
+    with raises(TypeError, match="abstract"):
+        Incomplete([])
+
+
+def test_chained_iterable_random_access() -> None:
+    iterable = ChainedIterable.range(40).product(repeat=8)
+    assert iterable.len() == 40 ** 8
+    assert iterable[40 ** 8 - 1] == (39,) * 8
+    assert iterable[10 ** 12 : 10 ** 12 + 2] == [
+        (6, 4, 5, 25, 0, 0, 0, 0),
+        (6, 4, 5, 25, 0, 0, 0, 1),
+    ]
+    shards = ChainedIterable.range(4).combinations(2).divide(3)
+    assert [shard.list() for shard in shards] == [
+        [(0, 1), (0, 2)],
+        [(0, 3), (1, 2)],
+        [(1, 3), (2, 3)],
+    ]
+    with raises(IndexError, match="ChainedIterable index out of range"):
+        ChainedIterable.range(3).powerset()[8]
+
+
+def test_chained_iterable_past_maxsize() -> None:
+    size = 100 ** 10
+    iterable = ChainedIterable.range(100).product(repeat=10)
+    assert iterable.len() == size
+    assert iterable[size - 1] == (99,) * 10
+    assert iterable != ChainedIterable.range(100).product(repeat=9)
+    assert iterable.islice(size - 2, size) == [
+        (99,) * 9 + (98,),
+        (99,) * 10,
+    ]
+    assert iterable.islice(size - 1).len() == size - 1
+    shards = iterable.divide(3)
+    assert [shard.len() for shard in shards] == [
+        size // 3 + 1,
+        size // 3,
+        size // 3,
+    ]
+    assert shards[2][size // 3 - 1] == (99,) * 10
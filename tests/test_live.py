@@ -0,0 +1,77 @@
+from functools import reduce
+from io import StringIO
+from operator import add
+from typing import List
+
+from hypothesis import given
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable import EmptyIterableError
+from chained_iterable.live import LiveView
+
+
+def _count(n: int, _: object) -> int:
+    return n + 1
+
+
+@given(chunks=lists(lists(integers(-5, 5))))
+def test_live(chunks: List[List[int]]) -> None:
+    source: List[int] = []
+    calls: List[int] = []
+
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    view = (
+        ChainedIterable(source)
+        .map(square)
+        .unique_everseen()
+        .filter(None)
+        .enumerate(start=1)
+        .starmap(lambda i, x: i * x)
+        .accumulate()
+        .live(add, 0)
+    )
+    assert isinstance(view, LiveView)
+    for chunk in chunks:
+        source.extend(chunk)
+        assert view.refresh().value == reduce(
+            add,
+            ChainedIterable(list(source))
+            .map(lambda x: x * x)
+            .unique_everseen()
+            .filter(None)
+            .enumerate(start=1)
+            .starmap(lambda i, x: i * x)
+            .accumulate(),
+            0,
+        )
+    assert calls == source
+
+
+def test_live_resumable_iterator() -> None:
+    file = StringIO()
+    view = ChainedIterable(file).map(str.strip).live(_count, 0)
+    assert view.value == 0
+    position = file.tell()
+    file.write("a\nb\n")
+    file.seek(position)
+    assert view.refresh().value == 2
+    position = file.tell()
+    file.write("c\n")
+    file.seek(position)
+    assert view.refresh().value == 3
+
+
+def test_live_errors() -> None:
+    view = ChainedIterable([]).live(max)
+    with raises(EmptyIterableError):
+        view.value
+    with raises(TypeError, match="pairwise cannot be maintained incrementally"):
+        ChainedIterable([]).pairwise().live(add)
+    with raises(TypeError, match="Expected a sequence or a resumable iterator"):
+        ChainedIterable({1}).live(add)
@@ -0,0 +1,115 @@
+from gc import collect
+from typing import List
+
+from hypothesis import given
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import mark
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable import MemoryBudgetExceededError
+from chained_iterable.memory import MemoryBudget
+from chained_iterable.memory import spill
+
+
+@given(ints=lists(integers()))
+def test_with_memory_limit_within_budget(ints: List[int]) -> None:
+    iterable = ChainedIterable(iter(ints)).with_memory_limit(10 ** 9)
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable.map(abs).list() == list(map(abs, ints))
+    peaks = iterable.memory_peaks()
+    if ints:
+        assert set(peaks) == {"list"}
+        assert peaks["list"] > 0
+    else:
+        assert peaks == {}
+    assert ChainedIterable(ints).memory_peaks() == {}
+
+
+@mark.parametrize(
+    "method_name, args",
+    [
+        ("list", ()),
+        ("tuple", ()),
+        ("set", ()),
+        ("frozenset", ()),
+        ("sorted", ()),
+        ("cache", ()),
+        ("random_permutation", ()),
+        ("random_combination", (1,)),
+    ],
+)
+def test_with_memory_limit_exceeded(method_name: str, args: tuple) -> None:
+    iterable = ChainedIterable.range(10_000).with_memory_limit(1000)
+    match = f"{method_name} buffered about \\d+ bytes, over the budget of 1000"
+    with raises(MemoryBudgetExceededError, match=match):
+        getattr(iterable, method_name)(*args)
+    assert iterable.memory_peaks()[method_name] > 1000
+
+
+def test_with_memory_limit_stages() -> None:
+    iterable = ChainedIterable.range(10_000).with_memory_limit(1000)
+    with raises(MemoryBudgetExceededError):
+        iterable.map(lambda x: (x, x)).dict()
+    with raises(MemoryBudgetExceededError):
+        iterable.map(lambda x: (x, x)).unzip()
+    with raises(MemoryBudgetExceededError, match="unique_everseen"):
+        for _ in iterable.unique_everseen():
+            pass
+    small = ChainedIterable([1, 1, 2]).with_memory_limit(10 ** 6)
+    assert small.unique_everseen() == [1, 2]
+
+
+def test_cache_spills() -> None:
+    iterable = ChainedIterable(x for x in range(10_000))
+    cached = iterable.with_memory_limit(1000, spill=True).cache()
+    assert cached == range(10_000)
+    assert cached.map(str).first() == "0"
+    assert cached.islice(5, 7) == [5, 6]
+    assert cached.memory_peaks()["cache"] > 1000
+    assert ChainedIterable([1]).with_memory_limit(
+        10 ** 6, spill=True,
+    ).cache() == [1]
+
+
+def test_spill_closes_its_file() -> None:
+    replay = spill([1, 2], iter(range(3, 3000)))
+    assert list(replay()) == list(range(1, 3000))
+    (owner,) = (cell.cell_contents for cell in replay.__closure__)
+    file = owner.file
+    running = replay()
+    assert next(running) == 1
+    del replay, owner
+    collect()
+    assert not file.closed
+    assert list(running) == list(range(2, 3000))
+    del running
+    collect()
+    assert file.closed
+
+
+def test_partition_after_spill() -> None:
+    evens, odds = (
+        ChainedIterable.range(10_000)
+        .with_memory_limit(1000, spill=True)
+        .cache()
+        .partition(lambda x: x % 2)
+    )
+    collect()
+    assert evens.len() == 5_000
+    assert odds.first() == 1
+
+
+def test_tail_is_tracked() -> None:
+    iterable = ChainedIterable.range(100_000).with_memory_limit(100)
+    with raises(MemoryBudgetExceededError, match="tail"):
+        iterable.tail(50_000)
+    iterable = ChainedIterable.range(100_000).with_memory_limit(10 ** 6)
+    assert iterable.tail(2) == [99_998, 99_999]
+    assert iterable.memory_peaks()["tail"] < 100
+
+
+def test_memory_budget() -> None:
+    with raises(ValueError, match="Expected a non-negative limit; got -1"):
+        MemoryBudget(-1)
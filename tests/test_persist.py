@@ -0,0 +1,177 @@
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+from typing import Iterator
+from typing import List
+
+from _pytest.monkeypatch import MonkeyPatch
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable.persist import evict
+from chained_iterable.persist import file_fingerprint
+
+
+_FACTOR = 2
+
+
+def _scale(x: int) -> int:
+    return _FACTOR * x
+
+
+def _scaled(x: int) -> int:
+    return _scale(x)
+
+
+class _Scale:
+    def __init__(self, factor: int) -> None:
+        self.factor = factor
+
+    def apply(self, x: int) -> int:
+        return self.factor * x
+
+
+def _double(x: int) -> int:
+    return 2 * x
+
+
+def _triple(x: int) -> int:
+    return 3 * x
+
+
+def _entries(path: Path) -> List[Path]:
+    return sorted(path.glob("*.chunks"))
+
+
+def _counting_range(n: int, pulls: List[int]) -> Callable[[], Iterator[int]]:
+    def factory() -> Iterator[int]:
+        for x in range(n):
+            pulls.append(x)
+            yield x
+
+    return factory
+
+
+def test_persist_hit_and_miss(tmp_path: Path) -> None:
+    pulls: List[int] = []
+
+    def build(func: Callable[[int], int] = _double) -> ChainedIterable[int]:
+        factory = _counting_range(10, pulls)
+        return ChainedIterable.from_factory(factory).map(func)
+
+    def persist(iterable: ChainedIterable[int]) -> ChainedIterable[int]:
+        return iterable.persist(
+            tmp_path, source_fingerprint="range(10)", chunk_size=3,
+        )
+
+    assert persist(build()) == list(map(_double, range(10)))
+    assert len(pulls) == 10
+    (entry,) = _entries(tmp_path)
+    assert persist(build()) == list(map(_double, range(10)))
+    assert len(pulls) == 10
+    assert persist(build(_triple)) == list(map(_triple, range(10)))
+    assert len(pulls) == 20
+    assert len(_entries(tmp_path)) == 2
+    downstream = persist(persist(build()).map(_double))
+    assert downstream == [4 * x for x in range(10)]
+    assert len(pulls) == 20
+
+
+def test_persist_tracks_globals(
+    tmp_path: Path, monkeypatch: MonkeyPatch,
+) -> None:
+    def build() -> ChainedIterable[int]:
+        return ChainedIterable.range(3).map(_scaled).persist(tmp_path)
+
+    assert build() == [0, 2, 4]
+    monkeypatch.setattr(f"{__name__}._FACTOR", 10)
+    assert build() == [0, 10, 20]
+    assert len(_entries(tmp_path)) == 2
+
+
+def test_persist_objects_and_version(tmp_path: Path) -> None:
+    lock = Lock()
+
+    def build(scale: _Scale, version: str = "1") -> ChainedIterable[int]:
+        def func(x: int) -> int:
+            with lock:
+                return scale.factor * x
+
+        iterable = ChainedIterable.range(3).map(func)
+        return iterable.persist(tmp_path, version=version)
+
+    assert build(_Scale(2)) == [0, 2, 4]
+    assert build(_Scale(2)) == [0, 2, 4]
+    assert len(_entries(tmp_path)) == 1
+    assert build(_Scale(3)) == [0, 3, 6]
+    assert build(_Scale(3), version="2") == [0, 3, 6]
+    assert len(_entries(tmp_path)) == 3
+
+
+def test_persist_early_stop_leaves_no_entry(tmp_path: Path) -> None:
+    iterable = ChainedIterable.range(10).map(_double).persist(tmp_path)
+    assert iterable.first() == 0
+    del iterable
+    assert not list(tmp_path.iterdir())
+
+
+def test_persist_source_fingerprint(tmp_path: Path) -> None:
+    source = tmp_path.joinpath("source.txt")
+    source.write_text("a\nb\n")
+
+    def build() -> ChainedIterable[str]:
+        return ChainedIterable.from_factory(source.open).map(str.strip)
+
+    cache_dir = tmp_path.joinpath("cache")
+    fingerprint = file_fingerprint(source, content=True)
+    assert build().persist(cache_dir, source_fingerprint=fingerprint) == [
+        "a",
+        "b",
+    ]
+    source.write_text("c\n")
+    fingerprint = file_fingerprint(source, content=True)
+    assert build().persist(cache_dir, source_fingerprint=fingerprint) == ["c"]
+    assert len(_entries(cache_dir)) == 2
+    assert file_fingerprint(source).endswith(str(source.stat().st_mtime_ns))
+    with raises(TypeError, match="Unable to fingerprint a"):
+        build().persist(cache_dir)
+
+
+def test_persist_eviction(tmp_path: Path) -> None:
+    for n in range(1, 5):
+        ChainedIterable.range(1000 * n).persist(tmp_path).list()
+    sizes = [entry.stat().st_size for entry in _entries(tmp_path)]
+    limit = sum(sizes) - 1
+    ChainedIterable.range(10).persist(tmp_path, max_bytes=limit).list()
+    assert len(_entries(tmp_path)) == 4
+    evict(tmp_path, 0)
+    assert not _entries(tmp_path)
+
+
+def test_persist_bound_methods(tmp_path: Path) -> None:
+    def build(scale: _Scale) -> ChainedIterable[int]:
+        return ChainedIterable.range(3).map(scale.apply).persist(tmp_path)
+
+    assert build(_Scale(2)) == [0, 2, 4]
+    assert build(_Scale(10)) == [0, 10, 20]
+    assert build(_Scale(2)) == [0, 2, 4]
+    assert len(_entries(tmp_path)) == 2
+    bound = ChainedIterable.range(3).map([10, 20, 30].__getitem__)
+    assert bound.persist(tmp_path) == [10, 20, 30]
+    bound = ChainedIterable.range(3).map([40, 50, 60].__getitem__)
+    assert bound.persist(tmp_path) == [40, 50, 60]
+
+
+def test_persist_unusual_arguments(tmp_path: Path) -> None:
+    def build() -> ChainedIterable[int]:
+        def func(x: int) -> int:
+            return later(x)
+
+        iterable = ChainedIterable.range(3).map(func)
+        iterable = iterable.persist(tmp_path.joinpath("a"))
+        later = abs
+        return iterable
+
+    assert build() == [0, 1, 2]
+    mixed = ChainedIterable([1, "b"]).map({1: "a", "b": 2}.get)
+    assert mixed.persist(tmp_path.joinpath("b")) == ["a", 2]
@@ -0,0 +1,108 @@
+from typing import Callable
+from typing import List
+
+from hypothesis import given
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable import pure
+from chained_iterable.pipeline import is_pure
+
+
+def _counting(func: Callable[[int], int], calls: List[int]) -> Callable:
+    def inner(x: int) -> int:
+        calls.append(x)
+        return func(x)
+
+    return inner
+
+
+def test_pure() -> None:
+    @pure
+    def double(x: int) -> int:
+        return 2 * x
+
+    assert is_pure(double)
+    assert not is_pure(lambda x: x)
+    assert is_pure(pure(abs)) and (pure(abs)(-1) == 1)
+
+
+@given(ints=lists(integers()), start=integers(0, 10), stop=integers(0, 10))
+def test_limit_pushed_above_pure_map(
+    ints: List[int], start: int, stop: int,
+) -> None:
+    calls: List[int] = []
+    func = pure(_counting(lambda x: 2 * x, calls))
+    iterable = ChainedIterable(iter(ints)).map(func).islice(start, stop)
+    assert iterable == [2 * x for x in ints[start:stop]]
+    assert calls == ints[start:stop]
+
+
+@given(ints=lists(integers()), n=integers(0, 10))
+def test_take_pushed_above_pure_map(ints: List[int], n: int) -> None:
+    calls: List[int] = []
+    func = pure(_counting(lambda x: x + 1, calls))
+    iterable = ChainedIterable(iter(ints)).map(func).map(func).take(n)
+    assert isinstance(iterable._iterable, list)
+    assert iterable.len() == len(ints[:n])
+    assert iterable == [x + 2 for x in ints[:n]]
+    assert len(calls) == 2 * len(ints[:n])
+
+
+@given(ints=lists(integers()))
+def test_filter_not_moved_above_pure_map(ints: List[int]) -> None:
+    iterable = (
+        ChainedIterable(iter(ints))
+        .map(pure(lambda x: 10 * x))
+        .filter(pure(lambda x: x > 20))
+    )
+    assert iterable == [10 * x for x in ints if 10 * x > 20]
+
+
+@given(ints=lists(integers()))
+def test_impure_map_is_not_rewritten(ints: List[int]) -> None:
+    calls: List[int] = []
+    iterable = (
+        ChainedIterable(iter(ints)).map(_counting(abs, calls)).islice(1, 3)
+    )
+    assert iterable == [abs(x) for x in ints[1:3]]
+    assert calls == ints[:3]
+
+
+@given(ints=lists(integers()))
+def test_reversed_reversed(ints: List[int]) -> None:
+    iterable = ChainedIterable(ints).reversed().reversed()
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable == ints
+
+
+def test_lineage_keeps_only_rewritable_parents() -> None:
+    iterable = ChainedIterable(range(3)).pipe(list).map(pure(abs))
+    source, stages = iterable._lineage()
+    assert source == range(3)
+    assert [stage.func for stage in stages] == [list, map]
+    assert iterable._parent is not None
+    assert iterable._parent._parent is None
+
+
+def test_partially_consumed_nodes_are_not_rewritten() -> None:
+    double = pure(lambda x: 2 * x)
+    mapped = ChainedIterable([1, 2, 3, 4]).map(double)
+    assert mapped.first() == 2
+    assert mapped.islice(2) == [4, 6]
+    mapped = ChainedIterable([1, 2, 3, 4]).map(double)
+    assert mapped.list() == [2, 4, 6, 8]
+    assert mapped.take(2) == []
+    mapped = ChainedIterable(iter([1, 2, 3, 4])).map(double)
+    assert mapped.first() == 2
+    assert mapped.islice(2) == [4, 6]
+    reversed_ = ChainedIterable([1, 2, 3]).reversed()
+    assert reversed_.first() == 3
+    with raises(TypeError):
+        reversed_.reversed()
+    original = ChainedIterable([1, 2, 3])
+    twice = original.reversed().reversed()
+    assert twice is not original
+    assert twice == [1, 2, 3]
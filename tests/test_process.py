@@ -0,0 +1,84 @@
+from subprocess import CalledProcessError
+from sys import executable
+from threading import Event
+from time import monotonic
+from typing import Iterator
+from typing import List
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+
+
+def _python(code: str) -> List[str]:
+    return [executable, "-c", code]
+
+
+@settings(max_examples=10, deadline=None)
+@given(ints=lists(integers()))
+def test_through_process(ints: List[int]) -> None:
+    iterable = ChainedIterable(iter(ints)).through_process(["sort", "-n"])
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable.map(int) == sorted(ints)
+
+
+def test_through_process_large_duplex() -> None:
+    # far more than a pipe buffer in both directions at once
+    iterable = ChainedIterable.range(200_000).through_process(["cat"])
+    assert iterable.map(int) == range(200_000)
+
+
+def test_through_process_custom_codec() -> None:
+    iterable = ChainedIterable([b"a", b"b"]).through_process(
+        ["cat"], encode=lambda x: x + b"\n", decode=bytes.strip,
+    )
+    assert iterable == [b"a", b"b"]
+
+
+def test_through_process_exit_status() -> None:
+    code = "import sys; sys.stderr.write('bad'); sys.exit(3)"
+    with raises(CalledProcessError) as info:
+        ChainedIterable([1]).through_process(_python(code)).list()
+    assert info.value.returncode == 3
+    assert info.value.stderr == b"bad"
+    iterable = ChainedIterable([1]).through_process(_python(code), check=False)
+    assert iterable == []
+
+
+def test_through_process_upstream_error() -> None:
+    def source() -> Iterator[int]:
+        yield 1
+        raise RuntimeError("upstream")
+
+    with raises(RuntimeError, match="upstream"):
+        ChainedIterable(source()).through_process(["cat"]).list()
+
+
+def test_through_process_early_stop() -> None:
+    iterable = ChainedIterable.count().through_process(["cat"])
+    assert iterable.islice(3) == ["0", "1", "2"]
+    assert iterable.first() == "3"
+    del iterable
+
+
+def test_through_process_early_stop_blocked_upstream() -> None:
+    release = Event()
+
+    def source() -> Iterator[int]:
+        yield 1
+        release.wait(10)
+        yield 2
+
+    code = "print('ready', flush=True); import sys; sys.stdin.read()"
+    iterable = ChainedIterable(source()).through_process(_python(code))
+    start = monotonic()
+    try:
+        assert iterable.first() == "ready"
+        del iterable
+        assert monotonic() - start < 5
+    finally:
+        release.set()
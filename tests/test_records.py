@@ -0,0 +1,85 @@
+from operator import lt
+from re import escape
+from types import SimpleNamespace
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from hypothesis import given
+from hypothesis.strategies import fixed_dictionaries
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from hypothesis.strategies import sampled_from
+from hypothesis.strategies import tuples
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+
+
+_rows = lists(fixed_dictionaries({"a": integers(), "b": integers()}))
+
+
+@given(rows=_rows)
+def test_select(rows: List[Dict[str, int]]) -> None:
+    iterable = ChainedIterable(iter(rows)).select("b", "a")
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable == [(row["b"], row["a"]) for row in rows]
+    assert ChainedIterable(rows).select("a") == [row["a"] for row in rows]
+
+
+@given(rows=lists(tuples(integers(), integers())))
+def test_select_attr(rows: List[Tuple[int, int]]) -> None:
+    objects = [SimpleNamespace(x=x, y=y) for x, y in rows]
+    assert ChainedIterable(objects).select("y", "x", attr=True) == [
+        (y, x) for x, y in rows
+    ]
+
+
+@given(
+    rows=_rows,
+    op=sampled_from(["==", "!=", "<", "<=", ">", ">=", lt]),
+    value=integers(),
+)
+def test_where(rows: List[Dict[str, int]], op: str, value: int) -> None:
+    expected = {
+        "==": lambda x: x == value,
+        "!=": lambda x: x != value,
+        "<": lambda x: x < value,
+        "<=": lambda x: x <= value,
+        ">": lambda x: x > value,
+        ">=": lambda x: x >= value,
+        lt: lambda x: x < value,
+    }[op]
+    iterable = ChainedIterable(iter(rows)).where("a", op, value)
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable == [row for row in rows if expected(row["a"])]
+
+
+def test_where_membership() -> None:
+    iterable = ChainedIterable([(1,), (2,), (3,)])
+    assert iterable.where(0, "in", {1, 3}) == [(1,), (3,)]
+    assert iterable.where(0, "not in", {1, 3}) == [(2,)]
+    with raises(ValueError, match="Expected an operator in"):
+        iterable.where(0, "~", 1)
+
+
+@given(rows=_rows)
+def test_with_column(rows: List[Dict[str, int]]) -> None:
+    iterable = ChainedIterable(iter(rows)).with_column(
+        "c", lambda row: row["a"] + row["b"],
+    )
+    assert iterable == [{**row, "c": row["a"] + row["b"]} for row in rows]
+    tuples_ = ChainedIterable([(1, 2)]).with_column(2, sum)
+    assert tuples_ == [(1, 2, 3)]
+    with raises(
+        ValueError,
+        match=escape(
+            "Expected the name of a column appended to a tuple of length 2 "
+            "to be 2; got 'c'",
+        ),
+    ):
+        ChainedIterable([(1, 2)]).with_column("c", sum).list()
+    with raises(
+        TypeError, match=escape("Expected a mapping or tuple; got a(n) int"),
+    ):
+        ChainedIterable([1]).with_column("c", str).list()
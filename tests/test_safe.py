@@ -0,0 +1,110 @@
+from threading import current_thread
+from threading import Event
+from threading import Thread
+from typing import List
+
+from hypothesis import given
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable.safe import DeadLetter
+
+
+def _reciprocal(x: int) -> float:
+    return 1 / x
+
+
+@given(ints=lists(integers(-3, 3)))
+def test_map_safe_collect(ints: List[int]) -> None:
+    results, dead_letters = ChainedIterable(iter(ints)).map_safe(
+        _reciprocal, on_error="collect",
+    )
+    assert isinstance(results, ChainedIterable)
+    assert results == [1 / x for x in ints if x]
+    assert isinstance(dead_letters, ChainedIterable)
+    letters = dead_letters.list()
+    assert [(d.index, d.value) for d in letters] == [
+        (i, x) for i, x in enumerate(ints) if not x
+    ]
+    assert all(isinstance(d.error, ZeroDivisionError) for d in letters)
+
+
+def test_map_safe_from_factory() -> None:
+    results, dead_letters = ChainedIterable.from_factory(
+        lambda: [1, 0, 2],
+    ).map_safe(_reciprocal, on_error="collect")
+    assert results.len() == 2
+    assert results == [1.0, 0.5]
+    assert dead_letters.map(lambda d: d[:2]) == [(1, 0)]
+
+
+@given(ints=lists(integers(-3, 3)))
+def test_map_safe_skip_and_raise(ints: List[int]) -> None:
+    results, dead_letters = ChainedIterable(iter(ints)).map_safe(
+        _reciprocal, on_error="skip",
+    )
+    assert results == [1 / x for x in ints if x]
+    assert dead_letters == []
+    results, _ = ChainedIterable(iter(ints)).map_safe(_reciprocal)
+    if 0 in ints:
+        with raises(ZeroDivisionError):
+            results.list()
+    else:
+        assert results == [1 / x for x in ints]
+
+
+def test_map_safe_retries() -> None:
+    attempts: List[int] = []
+
+    def flaky(x: int) -> int:
+        attempts.append(x)
+        if attempts.count(x) < 3:
+            raise RuntimeError(x)
+        return x
+
+    results, _ = ChainedIterable([1, 2]).map_safe(flaky, retries=2)
+    assert results == [1, 2]
+    assert attempts == [1, 1, 1, 2, 2, 2]
+    results, dead_letters = ChainedIterable([3]).map_safe(
+        flaky, on_error="collect", retries=1,
+    )
+    assert results == []
+    assert dead_letters.map(lambda d: d[:2]) == [(0, 3)]
+    assert attempts[-2:] == [3, 3]
+
+
+def test_map_safe_timeout() -> None:
+    release = Event()
+    hung: List[Thread] = []
+
+    def hang_on_zero(x: int) -> int:
+        if x == 0:
+            hung.append(current_thread())
+            release.wait(10)
+        return x
+
+    results, dead_letters = ChainedIterable([1, 0, 2]).map_safe(
+        hang_on_zero, on_error="collect", timeout=0.1,
+    )
+    try:
+        assert results == [1, 2]
+    finally:
+        release.set()
+    (thread,) = hung
+    assert thread.daemon
+    thread.join(1)
+    assert not thread.is_alive()
+    (dead_letter,) = dead_letters.list()
+    assert isinstance(dead_letter, DeadLetter)
+    assert dead_letter[:2] == (1, 0)
+    assert isinstance(dead_letter.error, TimeoutError)
+
+
+def test_map_safe_errors() -> None:
+    iterable = ChainedIterable([1])
+    with raises(ValueError, match="Expected on_error to be one of"):
+        iterable.map_safe(_reciprocal, on_error="ignore")
+    with raises(ValueError, match="Expected a non-negative retries; got -1"):
+        iterable.map_safe(_reciprocal, retries=-1)
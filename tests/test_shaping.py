@@ -0,0 +1,97 @@
+from asyncio import new_event_loop
+from threading import Thread
+from typing import AsyncIterator
+from typing import List
+
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable.shaping import throttle_async
+from chained_iterable.shaping import TokenBucket
+
+
+class _FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket() -> None:
+    time = _FakeTime()
+    bucket = TokenBucket(2.0, burst=3, clock=time.clock, sleep=time.sleep)
+    for _ in range(5):
+        bucket.acquire()
+    assert time.sleeps == [0.5, 0.5]
+    time.now += 10
+    bucket.acquire(3)
+    assert time.sleeps == [0.5, 0.5]
+    with raises(ValueError, match="Expected at most 3 tokens; got 4"):
+        bucket.acquire(4)
+    with raises(ValueError, match="Expected a positive rate; got 0"):
+        TokenBucket(0)
+
+
+def test_token_bucket_shared_between_threads() -> None:
+    time = _FakeTime()
+    bucket = TokenBucket(10.0, clock=time.clock, sleep=lambda _: None)
+    iterables = [
+        ChainedIterable.range(25).throttle(bucket=bucket) for _ in range(4)
+    ]
+    threads = [Thread(target=iterable.list) for iterable in iterables]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert bucket._tokens == 1 - 100
+
+
+def test_throttle() -> None:
+    time = _FakeTime()
+    bucket = TokenBucket(4.0, clock=time.clock, sleep=time.sleep)
+    iterable = ChainedIterable.range(5).throttle(bucket=bucket)
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable == range(5)
+    assert time.sleeps == [0.25] * 4
+    with raises(ValueError, match="Expected a rate or a bucket"):
+        ChainedIterable.range(5).throttle()
+    assert ChainedIterable.range(3).throttle(1e6, burst=3) == range(3)
+
+
+def test_throttle_async() -> None:
+    time = _FakeTime()
+    bucket = TokenBucket(1e6, burst=2, clock=time.clock)
+
+    async def source() -> AsyncIterator[int]:
+        for x in range(3):
+            yield x
+
+    async def collect() -> List[int]:
+        return [x async for x in throttle_async(source(), bucket)]
+
+    loop = new_event_loop()
+    try:
+        assert loop.run_until_complete(collect()) == [0, 1, 2]
+    finally:
+        loop.close()
+
+
+def test_debounce() -> None:
+    clock = iter([0.0, 0.1, 0.2, 1.5, 1.6, 3.0]).__next__
+    iterable = ChainedIterable(range(6)).debounce(1.0, clock=clock)
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable == [2, 4, 5]
+    assert ChainedIterable([]).debounce(1.0) == []
+
+
+def test_sample_every() -> None:
+    clock = iter([0.0, 0.1, 0.2, 1.5, 1.6, 3.0]).__next__
+    iterable = ChainedIterable(range(6)).sample_every(1.0, clock=clock)
+    assert isinstance(iterable, ChainedIterable)
+    assert iterable == [0, 3, 5]
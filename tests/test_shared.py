@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from typing import Iterator
+from typing import List
+
+from hypothesis import given
+from hypothesis import settings
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable.shared import SharedIterator
+
+
+@settings(max_examples=20, deadline=None)
+@given(ints=lists(integers()), batch=integers(1, 10))
+def test_shared(ints: List[int], batch: int) -> None:
+    shared = ChainedIterable(iter(ints)).shared(batch=batch)
+    assert isinstance(shared, SharedIterator)
+    with ThreadPoolExecutor(4) as pool:
+        parts = list(pool.map(lambda _: list(shared), range(4)))
+    assert sorted(x for part in parts for x in part) == sorted(ints)
+    assert sum(shared.claimed.values()) == len(ints)
+
+
+def test_shared_generator_source() -> None:
+    def source() -> Iterator[int]:
+        yield from range(10_000)
+
+    shared = ChainedIterable(source()).shared(batch=7)
+    barrier = Barrier(8)
+
+    def work(_: int) -> int:
+        barrier.wait()
+        return sum(shared)
+
+    with ThreadPoolExecutor(8) as pool:
+        assert sum(pool.map(work, range(8))) == sum(range(10_000))
+
+
+def test_shared_cancel() -> None:
+    shared = ChainedIterable.count().shared(batch=5)
+    assert [next(shared) for _ in range(3)] == [0, 1, 2]
+    shared.cancel()
+    assert shared.cancelled
+    assert list(shared) == []
+    assert list(shared.claimed.values()) == [5]
+
+
+def test_shared_errors() -> None:
+    def source() -> Iterator[int]:
+        yield from range(5)
+        raise RuntimeError("upstream")
+
+    shared = ChainedIterable(source()).shared()
+    assert [next(shared) for _ in range(5)] == list(range(5))
+    assert list(shared.claimed.values()) == [5]
+    with raises(RuntimeError, match="upstream"):
+        next(shared)
+    assert list(shared) == []
+    shared = ChainedIterable(source()).shared(batch=5)
+    assert [next(shared) for _ in range(5)] == list(range(5))
+    with raises(RuntimeError, match="upstream"):
+        next(shared)
+    with raises(ValueError, match="Expected a batch at least 1; got 0"):
+        ChainedIterable([]).shared(batch=0)
@@ -0,0 +1,113 @@
+from collections import Counter
+from typing import List
+
+from hypothesis import given
+from hypothesis.strategies import integers
+from hypothesis.strategies import lists
+from pytest import raises
+
+from chained_iterable import ChainedIterable
+from chained_iterable import EmptyIterableError
+from chained_iterable.sketches import HyperLogLog
+from chained_iterable.sketches import QuantileSketch
+
+
+def test_approx_distinct() -> None:
+    sketch = (
+        ChainedIterable.range(50_000)
+        .map(lambda x: x % 20_000)
+        .approx_distinct()
+    )
+    assert isinstance(sketch, HyperLogLog)
+    assert abs(sketch.count() - 20_000) <= 4 * sketch.relative_error * 20_000
+
+
+@given(ints=lists(integers(0, 100), max_size=50))
+def test_approx_distinct_small(ints: List[int]) -> None:
+    assert ChainedIterable(ints).approx_distinct().count() == len(set(ints))
+
+
+def test_approx_distinct_equality() -> None:
+    class Point:
+        def __eq__(self, other: object) -> bool:
+            return isinstance(other, Point)
+
+        def __hash__(self) -> int:
+            return 0
+
+    values = [1, 1.0, True, "1", b"1", (1, "a"), (1.0, "a"), None, 0.5]
+    assert ChainedIterable(values).approx_distinct().count() == len(
+        set(values),
+    )
+    points = ChainedIterable.repeat(None, 100).map(lambda _: Point())
+    assert points.approx_distinct().count() == 1
+
+
+def test_approx_distinct_merge() -> None:
+    left = ChainedIterable.range(0, 30_000).approx_distinct()
+    right = ChainedIterable.range(10_000, 40_000).approx_distinct()
+    merged = left.merge(right)
+    assert abs(merged.count() - 40_000) <= 4 * merged.relative_error * 40_000
+    with raises(ValueError, match="Expected equal precisions; got 14 and 10"):
+        left.merge(HyperLogLog(10))
+
+
+def test_approx_quantiles() -> None:
+    n = 100_000
+    values = ChainedIterable.range(n).map(lambda x: (x * 7919) % n)
+    sketch = values.approx_quantiles(seed=0)
+    assert isinstance(sketch, QuantileSketch)
+    qs = [0.0, 0.1, 0.5, 0.9, 1.0]
+    for q, value in zip(qs, sketch.quantiles(qs)):
+        assert abs(value / n - q) <= 2 * sketch.rank_error
+
+
+def test_approx_quantiles_merge() -> None:
+    left = ChainedIterable.range(0, 50_000).approx_quantiles(seed=0)
+    right = ChainedIterable.range(50_000, 100_000).approx_quantiles(seed=1)
+    merged = left.merge(right)
+    assert abs(merged.quantile(0.5) / 100_000 - 0.5) <= 2 * merged.rank_error
+    with raises(EmptyIterableError):
+        QuantileSketch().quantile(0.5)
+
+
+@given(ints=lists(integers(0, 10)))
+def test_heavy_hitters(ints: List[int]) -> None:
+    sketch = ChainedIterable(iter(ints)).heavy_hitters(3)
+    counts = Counter(ints)
+    for x, estimate, error in sketch.top():
+        assert estimate - error <= counts[x] <= estimate
+    for x, n in counts.items():
+        if n > sketch.error:
+            assert x in {y for y, _, _ in sketch.top()}
+
+
+def test_heavy_hitters_many_distinct() -> None:
+    ints = ChainedIterable.range(20_000).map(lambda x: 7 if x % 4 else x)
+    (top,) = ints.heavy_hitters(100).top(1)
+    assert top[0] == 7
+    assert top[1] - top[2] <= 15_000 <= top[1]
+
+
+def test_heavy_hitters_merge() -> None:
+    left = ChainedIterable([1] * 50 + list(range(100, 150))).heavy_hitters(5)
+    right = ChainedIterable([2] * 30 + [1] * 10).heavy_hitters(5)
+    merged = left.merge(right)
+    assert [x for x, _, _ in merged.top(2)] == [1, 2]
+
+
+@given(ints=lists(integers()), k=integers(0, 10))
+def test_sample(ints: List[int], k: int) -> None:
+    sample = ChainedIterable(iter(ints)).sample(k, seed=0)
+    assert sample.seen == len(ints)
+    assert len(sample.items) == min(k, len(ints))
+    assert not Counter(sample.items) - Counter(ints)
+
+
+def test_sample_weighted_and_merge() -> None:
+    iterable = ChainedIterable([0] * 1000 + [1])
+    sample = iterable.sample(1, weight=lambda x: 1e9 if x else 1.0, seed=0)
+    assert sample.items == [1]
+    merged = sample.merge(ChainedIterable.range(10).sample(5, seed=0))
+    assert merged.seen == 1011
+    assert len(merged.items) == 1
@@ -1,5 +1,13 @@
+from chained_iterable.utilities import is_islice_compatible
 from chained_iterable.utilities import sentinel
 
 
 def test_sentinel() -> None:
     assert repr(sentinel) == "<sentinel>"
+
+
+def test_is_islice_compatible() -> None:
+    assert is_islice_compatible(slice(None))
+    assert is_islice_compatible(slice(1, 5, 2))
+    assert not is_islice_compatible(slice(-1, None))
+    assert not is_islice_compatible(slice(None, None, -1))